@@ -12,16 +12,29 @@ Usage:
 """
 
 import argparse
-import json
+import io
 import sys
 from dataclasses import dataclass, field
 from datetime import datetime
-from typing import Any, Dict, List, Tuple, Set, Optional
+from functools import lru_cache
+from operator import itemgetter
+from types import MappingProxyType
+from typing import Any, Dict, Iterator, List, Mapping, Tuple, Set, Optional, TextIO
+
+try:
+    # Optional: orjson parses large exports several times faster.
+    from orjson import loads as json_loads
+except ImportError:
+    from json import loads as json_loads
 
 TECHNIQUE_ENUM_PATH = "src/domain/cards.zig"
+REPORT_TIMESTAMP_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+# Shared read-only default for `.get(key, EMPTY)`, instead of a fresh {} per lookup.
+EMPTY: Mapping[str, Any] = MappingProxyType({})
 
 
-@dataclass
+@dataclass(slots=True)
 class AuditEntry:
     """A single entry in the audit report."""
     dataset: str
@@ -31,14 +44,15 @@ class AuditEntry:
     errors: List[str] = field(default_factory=list)
 
 
-@dataclass
+@dataclass(slots=True)
 class AuditReport:
     """Accumulates audit entries and produces a report."""
-    entries: List[AuditEntry] = field(default_factory=list)
+    # Entries grouped by dataset, in insertion order; the only copy of each entry
+    entries_by_dataset: Dict[str, List[AuditEntry]] = field(default_factory=dict)
     cross_ref_errors: List[str] = field(default_factory=list)
     summary: Dict[str, Dict[str, int]] = field(default_factory=dict)
 
-    # ID sets for cross-reference validation
+    # ID sets for cross-reference validation (frozen by freeze() after ingestion)
     weapon_ids: Set[str] = field(default_factory=set)
     technique_ids: Set[str] = field(default_factory=set)
     armour_material_ids: Set[str] = field(default_factory=set)
@@ -48,65 +62,85 @@ class AuditReport:
     body_plan_ids: Set[str] = field(default_factory=set)
     body_plan_refs: Set[str] = field(default_factory=set)  # T042: species -> body_plan refs
 
+    # Running totals of entries with warnings/errors, maintained by add_entry
+    _warn_entries: int = field(default=0, init=False, repr=False)
+    _err_entries: int = field(default=0, init=False, repr=False)
+    # Sorted summary rows for to_markdown; None until built, reset by add_entry
+    _summary_sorted: Optional[List[Tuple[str, Dict[str, int]]]] = field(default=None, init=False, repr=False)
+
     def add_entry(self, entry: AuditEntry) -> None:
-        self.entries.append(entry)
+        self._summary_sorted = None
         ds = entry.dataset
+        self.entries_by_dataset.setdefault(ds, []).append(entry)
         if ds not in self.summary:
             self.summary[ds] = {"total": 0, "warnings": 0, "errors": 0}
         self.summary[ds]["total"] += 1
         if entry.warnings:
             self.summary[ds]["warnings"] += 1
+            self._warn_entries += 1
         if entry.errors:
             self.summary[ds]["errors"] += 1
+            self._err_entries += 1
+
+    def freeze(self) -> None:
+        """Snapshot the ID sets once ingestion is done; later .add() calls fail loudly."""
+        self.weapon_ids = frozenset(self.weapon_ids)
+        self.technique_ids = frozenset(self.technique_ids)
+        self.armour_material_ids = frozenset(self.armour_material_ids)
+        self.armour_piece_ids = frozenset(self.armour_piece_ids)
+        self.tissue_template_ids = frozenset(self.tissue_template_ids)
+        self.tissue_material_ids = frozenset(self.tissue_material_ids)
+        self.body_plan_ids = frozenset(self.body_plan_ids)
+        self.body_plan_refs = frozenset(self.body_plan_refs)
 
     def add_cross_ref_error(self, msg: str) -> None:
         self.cross_ref_errors.append(msg)
 
     def has_errors(self) -> bool:
-        for entry in self.entries:
-            if entry.errors:
-                return True
-        return bool(self.cross_ref_errors)
+        return self._err_entries > 0 or bool(self.cross_ref_errors)
 
     def warning_count(self) -> int:
-        return sum(1 for e in self.entries if e.warnings)
+        return self._warn_entries
 
     def error_count(self) -> int:
-        return sum(1 for e in self.entries if e.errors) + len(self.cross_ref_errors)
+        return self._err_entries + len(self.cross_ref_errors)
 
     def to_markdown(self) -> str:
-        lines: List[str] = []
-        lines.append("# Data Audit Report")
-        lines.append("")
-        lines.append(f"Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
-        lines.append("")
+        buf = io.StringIO()
+        self.write_markdown(buf)
+        return buf.getvalue().removesuffix("\n")
+
+    def write_markdown(self, fp: TextIO) -> None:
+        """Stream the report to `fp`, newline-terminated."""
+        w = fp.write
+        w("# Data Audit Report\n\n")
+        w(f"Generated: {datetime.now().strftime(REPORT_TIMESTAMP_FORMAT)}\n\n")
 
         # Summary
-        lines.append("## Summary")
-        lines.append("")
-        lines.append("| Dataset | Total | With Warnings | With Errors |")
-        lines.append("|---------|-------|---------------|-------------|")
-        for ds, counts in sorted(self.summary.items()):
-            lines.append(f"| {ds} | {counts['total']} | {counts['warnings']} | {counts['errors']} |")
-        lines.append("")
+        w("## Summary\n\n")
+        w("| Dataset | Total | With Warnings | With Errors |\n")
+        w("|---------|-------|---------------|-------------|\n")
+        if self._summary_sorted is None:
+            self._summary_sorted = sorted(self.summary.items())
+        for ds, counts in self._summary_sorted:
+            w(f"| {ds} | {counts['total']} | {counts['warnings']} | {counts['errors']} |\n")
+        w("\n")
 
         total_warnings = self.warning_count()
         total_errors = self.error_count()
         if total_errors > 0:
-            lines.append(f"**STATUS: FAILED** - {total_errors} error(s), {total_warnings} warning(s)")
+            w(f"**STATUS: FAILED** - {total_errors} error(s), {total_warnings} warning(s)\n\n")
         elif total_warnings > 0:
-            lines.append(f"**STATUS: PASSED with warnings** - {total_warnings} warning(s)")
+            w(f"**STATUS: PASSED with warnings** - {total_warnings} warning(s)\n\n")
         else:
-            lines.append("**STATUS: PASSED** - All validations passed")
-        lines.append("")
+            w("**STATUS: PASSED** - All validations passed\n\n")
 
         # Cross-reference errors
         if self.cross_ref_errors:
-            lines.append("## Cross-Reference Errors")
-            lines.append("")
+            w("## Cross-Reference Errors\n\n")
             for err in self.cross_ref_errors:
-                lines.append(f"- {err}")
-            lines.append("")
+                w(f"- {err}\n")
+            w("\n")
 
         # Per-dataset details
         datasets_order = [
@@ -114,47 +148,34 @@ class AuditReport:
             "armour_pieces", "tissue_templates", "body_plans"
         ]
         for ds in datasets_order:
-            ds_entries = [e for e in self.entries if e.dataset == ds]
+            ds_entries = self.entries_by_dataset.get(ds)
             if not ds_entries:
                 continue
 
-            lines.append(f"## {ds.replace('_', ' ').title()}")
-            lines.append("")
-
             # Entries with issues first
-            issues = [e for e in ds_entries if e.warnings or e.errors]
-            clean = [e for e in ds_entries if not e.warnings and not e.errors]
+            issues: List[AuditEntry] = []
+            clean: List[AuditEntry] = []
+            for e in ds_entries:
+                (issues if e.warnings or e.errors else clean).append(e)
+
+            w(f"## {ds.replace('_', ' ').title()}\n\n")
 
             if issues:
-                lines.append("### Issues")
-                lines.append("")
+                w("### Issues\n\n")
                 for entry in issues:
-                    lines.append(f"#### `{entry.id}`")
-                    lines.append("")
-                    if entry.errors:
-                        for err in entry.errors:
-                            lines.append(f"- **ERROR**: {err}")
-                    if entry.warnings:
-                        for warn in entry.warnings:
-                            lines.append(f"- WARNING: {warn}")
-                    lines.append("")
+                    errors = "".join([f"- **ERROR**: {err}\n" for err in entry.errors])
+                    warnings = "".join([f"- WARNING: {warn}\n" for warn in entry.warnings])
+                    w(f"#### `{entry.id}`\n\n{errors}{warnings}\n")
                     # Show relevant fields
                     if entry.fields:
-                        lines.append("Fields:")
-                        lines.append("```")
-                        for k, v in entry.fields.items():
-                            lines.append(f"  {k}: {v}")
-                        lines.append("```")
-                        lines.append("")
+                        fields = "".join([f"  {k}: {v}\n" for k, v in entry.fields.items()])
+                        w(f"Fields:\n```\n{fields}```\n\n")
 
             # Summary table for clean entries
             if clean:
-                lines.append("### Valid Entries")
-                lines.append("")
-                lines.append(self._format_dataset_table(ds, clean))
-                lines.append("")
-
-        return "\n".join(lines)
+                w("### Valid Entries\n\n")
+                w(self._format_dataset_table(ds, clean))
+                w("\n\n")
 
     def _format_dataset_table(self, dataset: str, entries: List[AuditEntry]) -> str:
         """Format a summary table for valid entries."""
@@ -173,8 +194,8 @@ class AuditReport:
             lines.append("|----|------|-----|--------|-------|----------|")
             for e in entries:
                 f = e.fields
-                ch = f.get('channels', {})
-                ch_str = ",".join(k for k, v in ch.items() if v)
+                ch = f.get('channels', EMPTY)
+                ch_str = ",".join([k for k, v in ch.items() if v])
                 lines.append(f"| {e.id} | {f.get('attack_mode', '-')} | {f.get('axis_geometry_mult', 1):.2f} | {f.get('axis_energy_mult', 1):.2f} | {f.get('axis_rigidity_mult', 1):.2f} | {ch_str or '-'} |")
         elif dataset == "armour_materials":
             lines.append("| ID | Defl | Abs | Disp | GeoThr | EnerThr | RigThr |")
@@ -229,28 +250,37 @@ def parse_args() -> argparse.Namespace:
 
 
 def load_json(args: argparse.Namespace) -> Dict[str, Any]:
+    """Parse the whole CUE export up front.
+
+    Not streamed: generation and audit both read across datasets, and the
+    output order is fixed independently of the input's key order, so every
+    section has to be resident before emission starts anyway.
+    """
     if args.input_file:
-        with open(args.input_file, "r", encoding="utf-8") as f:
-            return json.load(f)
-    data = sys.stdin.read()
-    return json.loads(data)
+        with open(args.input_file, "rb") as f:
+            return json_loads(f.read())
+    return json_loads(sys.stdin.buffer.read())
 
 
 def flatten_weapons(root: Dict[str, Any]) -> List[Tuple[str, Dict[str, Any]]]:
     results: List[Tuple[str, Dict[str, Any]]] = []
 
-    def visit(prefix: List[str], node: Dict[str, Any]) -> None:
-        for key, value in node.items():
+    # Depth-first walk with an explicit stack of (prefix, items iterator);
+    # resuming the parent's iterator keeps the same order as recursion would.
+    stack: List[Tuple[Tuple[str, ...], Iterator[Tuple[str, Any]]]] = [((), iter(root.items()))]
+    while stack:
+        prefix, items = stack[-1]
+        for key, value in items:
             if not isinstance(value, dict):
                 continue
-            next_prefix = prefix + [key]
+            next_prefix = prefix + (key,)
             if "name" in value:
-                weapon_id = ".".join(next_prefix)
-                results.append((weapon_id, value))
+                results.append((".".join(next_prefix), value))
             else:
-                visit(next_prefix, value)
-
-    visit([], root)
+                stack.append((next_prefix, iter(value.items())))
+                break
+        else:
+            stack.pop()
     return results
 
 
@@ -258,14 +288,39 @@ def zig_bool(value: bool) -> str:
     return "true" if value else "false"
 
 
+@lru_cache(maxsize=8192)
 def zig_float(value: float) -> str:
+    # Memoised: the data is dominated by a small set of repeated constants.
+    if value == 0.0:
+        return "0"
+    if value == 1.0:
+        return "1"
     return f"{value:.4f}".rstrip("0").rstrip(".")
 
 
+# Characters that would terminate or corrupt a Zig string literal
+ZIG_STRING_ESCAPES = str.maketrans({
+    '"': '\\"',
+    "\\": "\\\\",
+    "\n": "\\n",
+    "\r": "\\r",
+    "\t": "\\t",
+})
+
+
+@lru_cache(maxsize=None)
+def zig_str(value: Any) -> str:
+    """Quote a value as an escaped Zig string literal.
+
+    Memoised: IDs, tags and tissue template names recur across many records.
+    """
+    return '"' + str(value).translate(ZIG_STRING_ESCAPES) + '"'
+
+
 def zig_string_list(values: List[str]) -> str:
     if not values:
         return "&.{}"
-    inner = ", ".join(f"\"{v}\"" for v in values)
+    inner = ", ".join(map(zig_str, values))
     return f"&.{{ {inner} }}"
 
 
@@ -305,7 +360,7 @@ def format_damage_types_list(types: List[str]) -> str:
     """Format a list of damage types as a Zig slice literal."""
     if not types:
         return "&.{}"
-    inner = ", ".join(format_damage_kind(t) for t in types)
+    inner = ", ".join(map(format_damage_kind, types))
     return f"&.{{ {inner} }}"
 
 
@@ -313,238 +368,247 @@ def format_categories_list(cats: List[str]) -> str:
     """Format a list of weapon categories as a Zig slice literal."""
     if not cats:
         return "&.{}"
-    inner = ", ".join(format_weapon_category(c) for c in cats)
+    inner = ", ".join(map(format_weapon_category, cats))
     return f"&.{{ {inner} }}"
 
 
-def emit_defender_modifiers(mods: Dict[str, Any], indent: str) -> List[str]:
+def emit_defender_modifiers(mods: Dict[str, Any], indent: str) -> str:
     """Emit DefenderModifiersDefinition inline."""
-    lines: List[str] = []
-    lines.append(f"{indent}.defender_modifiers = .{{")
-    lines.append(f"{indent}    .reach = {format_reach(mods.get('reach', 'clinch'))},")
-    lines.append(f"{indent}    .parry = {zig_float(mods.get('parry', 1.0))},")
-    lines.append(f"{indent}    .deflect = {zig_float(mods.get('deflect', 1.0))},")
-    lines.append(f"{indent}    .block = {zig_float(mods.get('block', 1.0))},")
-    lines.append(f"{indent}    .fragility = {zig_float(mods.get('fragility', 1.0))},")
-    lines.append(f"{indent}}},")
-    return lines
+    return (
+        f"{indent}.defender_modifiers = .{{\n"
+        f"{indent}    .reach = {format_reach(mods.get('reach', 'clinch'))},\n"
+        f"{indent}    .parry = {zig_float(mods.get('parry', 1.0))},\n"
+        f"{indent}    .deflect = {zig_float(mods.get('deflect', 1.0))},\n"
+        f"{indent}    .block = {zig_float(mods.get('block', 1.0))},\n"
+        f"{indent}    .fragility = {zig_float(mods.get('fragility', 1.0))},\n"
+        f"{indent}}},\n"
+    )
 
 
-def emit_offensive_profile(profile: Dict[str, Any], indent: str) -> List[str]:
+def emit_offensive_profile(profile: Dict[str, Any], indent: str) -> str:
     """Emit OffensiveProfileDefinition inline."""
-    lines: List[str] = []
-    lines.append(f"{indent}.name = \"{profile.get('name', '')}\",")
-    lines.append(f"{indent}.reach = {format_reach(profile.get('reach', 'clinch'))},")
-    lines.append(f"{indent}.damage_types = {format_damage_types_list(profile.get('damage_types', []))},")
-    lines.append(f"{indent}.accuracy = {zig_float(profile.get('accuracy', 1.0))},")
-    lines.append(f"{indent}.speed = {zig_float(profile.get('speed', 1.0))},")
-    lines.append(f"{indent}.damage = {zig_float(profile.get('damage', 0.0))},")
-    lines.append(f"{indent}.penetration = {zig_float(profile.get('penetration', 0.0))},")
-    lines.append(f"{indent}.penetration_max = {zig_float(profile.get('penetration_max', 0.0))},")
-    lines.append(f"{indent}.fragility = {zig_float(profile.get('fragility', 1.0))},")
-    lines.extend(emit_defender_modifiers(profile.get('defender_modifiers', {}), indent))
-    return lines
-
-
-def emit_defensive_profile(profile: Dict[str, Any], indent: str) -> List[str]:
+    return (
+        f"{indent}.name = {zig_str(profile.get('name', ''))},\n"
+        f"{indent}.reach = {format_reach(profile.get('reach', 'clinch'))},\n"
+        f"{indent}.damage_types = {format_damage_types_list(profile.get('damage_types', []))},\n"
+        f"{indent}.accuracy = {zig_float(profile.get('accuracy', 1.0))},\n"
+        f"{indent}.speed = {zig_float(profile.get('speed', 1.0))},\n"
+        f"{indent}.damage = {zig_float(profile.get('damage', 0.0))},\n"
+        f"{indent}.penetration = {zig_float(profile.get('penetration', 0.0))},\n"
+        f"{indent}.penetration_max = {zig_float(profile.get('penetration_max', 0.0))},\n"
+        f"{indent}.fragility = {zig_float(profile.get('fragility', 1.0))},\n"
+        + emit_defender_modifiers(profile.get('defender_modifiers', EMPTY), indent)
+    )
+
+
+def emit_defensive_profile(profile: Dict[str, Any], indent: str) -> str:
     """Emit DefensiveProfileDefinition inline."""
-    lines: List[str] = []
-    lines.append(f"{indent}.name = \"{profile.get('name', '')}\",")
-    lines.append(f"{indent}.reach = {format_reach(profile.get('reach', 'clinch'))},")
-    lines.append(f"{indent}.parry = {zig_float(profile.get('parry', 0.0))},")
-    lines.append(f"{indent}.deflect = {zig_float(profile.get('deflect', 0.0))},")
-    lines.append(f"{indent}.block = {zig_float(profile.get('block', 0.0))},")
-    lines.append(f"{indent}.fragility = {zig_float(profile.get('fragility', 1.0))},")
-    return lines
+    return (
+        f"{indent}.name = {zig_str(profile.get('name', ''))},\n"
+        f"{indent}.reach = {format_reach(profile.get('reach', 'clinch'))},\n"
+        f"{indent}.parry = {zig_float(profile.get('parry', 0.0))},\n"
+        f"{indent}.deflect = {zig_float(profile.get('deflect', 0.0))},\n"
+        f"{indent}.block = {zig_float(profile.get('block', 0.0))},\n"
+        f"{indent}.fragility = {zig_float(profile.get('fragility', 1.0))},\n"
+    )
+
+
+WEAPON_FEATURE_FLAGS = ("hooked", "spiked", "crossguard", "pommel")
+WEAPON_GRIP_FLAGS = ("one_handed", "two_handed", "versatile", "bastard", "half_sword", "murder_stroke")
+
+
+def format_true_flags(flags: Dict[str, Any], names: Tuple[str, ...], indent: str) -> str:
+    """Emit one `.name = true,` line per set flag; unset flags keep their struct default."""
+    return "".join([f"{indent}.{name} = true,\n" for name in names if flags.get(name)])
+
+
+def format_present_fields(
+    source: Dict[str, Any], fields: Tuple[Tuple[str, str, Any], ...], indent: str
+) -> str:
+    """Emit one `.name = value,` line per (name, key, formatter) whose key is non-null."""
+    return "".join([
+        f"{indent}.{name} = {fmt(source[key])},\n"
+        for name, key, fmt in fields
+        if source.get(key) is not None
+    ])
+
+
+# Per-record templates: one C-level `%` format per record instead of an
+# interpreted f-string per line. Optional blocks are pre-rendered ("" if absent).
+WEAPON_TEMPLATE = (
+    "    .{\n"
+    "        .id = %(id)s,\n"
+    "        .name = %(name)s,\n"
+    "        .categories = %(categories)s,\n"
+    "        .features = .{\n%(features)s        },\n"
+    "        .grip = .{\n%(grip)s        },\n"
+    "        .length = %(length)s,\n"
+    "        .weight = %(weight)s,\n"
+    "        .balance = %(balance)s,\n"
+    "        .integrity = %(integrity)s,\n"
+    "%(swing)s"
+    "%(thrust)s"
+    "        .defence = .{\n%(defence)s        },\n"
+    "%(ranged)s"
+    "        .moment_of_inertia = %(moment_of_inertia)s,\n"
+    "        .effective_mass = %(effective_mass)s,\n"
+    "        .reference_energy_j = %(reference_energy_j)s,\n"
+    "        .geometry_coeff = %(geometry_coeff)s,\n"
+    "        .rigidity_coeff = %(rigidity_coeff)s,\n"
+    "    },\n"
+)
+
+
+def emit_ranged(ranged: Dict[str, Any]) -> str:
+    """Emit RangedDefinition inline."""
+    thrown_block = ""
+    thrown = ranged.get("thrown")
+    if thrown:
+        throw = emit_offensive_profile(thrown.get("throw", EMPTY), "                    ")
+        thrown_block = (
+            "            .thrown = .{\n"
+            f"                .throw = .{{\n{throw}                }},\n"
+            f"                .range = {format_reach(thrown.get('range', 'medium'))},\n"
+            "            },\n"
+        )
+    projectile_block = ""
+    projectile = ranged.get("projectile")
+    if projectile:
+        projectile_block = (
+            "            .projectile = .{\n"
+            f"                .ammunition = {format_projectile_type(projectile.get('ammunition', 'stone'))},\n"
+            f"                .range = {format_reach(projectile.get('range', 'far'))},\n"
+            f"                .accuracy = {zig_float(projectile.get('accuracy', 1.0))},\n"
+            f"                .speed = {zig_float(projectile.get('speed', 1.0))},\n"
+            f"                .reload = {zig_float(projectile.get('reload', 0.0))},\n"
+            "            },\n"
+        )
+    return f"        .ranged = .{{\n{thrown_block}{projectile_block}        }},\n"
 
 
 def emit_weapons(weapons: List[Tuple[str, Dict[str, Any]]]) -> str:
-    lines: List[str] = []
+    if not weapons:
+        return ""
+    buf = io.StringIO()
+    w = buf.write
 
     # Struct definitions
-    lines.append("pub const DefenderModifiersDefinition = struct {")
-    lines.append("    reach: combat.Reach,")
-    lines.append("    parry: f32,")
-    lines.append("    deflect: f32,")
-    lines.append("    block: f32,")
-    lines.append("    fragility: f32,")
-    lines.append("};")
-    lines.append("")
-    lines.append("pub const OffensiveProfileDefinition = struct {")
-    lines.append("    name: []const u8,")
-    lines.append("    reach: combat.Reach,")
-    lines.append("    damage_types: []const damage.Kind,")
-    lines.append("    accuracy: f32,")
-    lines.append("    speed: f32,")
-    lines.append("    damage: f32,")
-    lines.append("    penetration: f32,")
-    lines.append("    penetration_max: f32,")
-    lines.append("    fragility: f32,")
-    lines.append("    defender_modifiers: DefenderModifiersDefinition,")
-    lines.append("};")
-    lines.append("")
-    lines.append("pub const DefensiveProfileDefinition = struct {")
-    lines.append("    name: []const u8,")
-    lines.append("    reach: combat.Reach,")
-    lines.append("    parry: f32,")
-    lines.append("    deflect: f32,")
-    lines.append("    block: f32,")
-    lines.append("    fragility: f32,")
-    lines.append("};")
-    lines.append("")
-    lines.append("pub const GripDefinition = struct {")
-    lines.append("    one_handed: bool = false,")
-    lines.append("    two_handed: bool = false,")
-    lines.append("    versatile: bool = false,")
-    lines.append("    bastard: bool = false,")
-    lines.append("    half_sword: bool = false,")
-    lines.append("    murder_stroke: bool = false,")
-    lines.append("};")
-    lines.append("")
-    lines.append("pub const FeaturesDefinition = struct {")
-    lines.append("    hooked: bool = false,")
-    lines.append("    spiked: bool = false,")
-    lines.append("    crossguard: bool = false,")
-    lines.append("    pommel: bool = false,")
-    lines.append("};")
-    lines.append("")
-    lines.append("pub const ThrownDefinition = struct {")
-    lines.append("    throw: OffensiveProfileDefinition,")
-    lines.append("    range: combat.Reach,")
-    lines.append("};")
-    lines.append("")
-    lines.append("pub const ProjectileDefinition = struct {")
-    lines.append("    ammunition: weapon.ProjectileType,")
-    lines.append("    range: combat.Reach,")
-    lines.append("    accuracy: f32,")
-    lines.append("    speed: f32,")
-    lines.append("    reload: f32,")
-    lines.append("};")
-    lines.append("")
-    lines.append("pub const RangedDefinition = struct {")
-    lines.append("    projectile: ?ProjectileDefinition = null,")
-    lines.append("    thrown: ?ThrownDefinition = null,")
-    lines.append("};")
-    lines.append("")
-    lines.append("pub const WeaponDefinition = struct {")
-    lines.append("    id: []const u8,")
-    lines.append("    name: []const u8,")
-    lines.append("    categories: []const weapon.Category,")
-    lines.append("    features: FeaturesDefinition = .{},")
-    lines.append("    grip: GripDefinition = .{},")
-    lines.append("    length: f32,")
-    lines.append("    weight: f32,")
-    lines.append("    balance: f32,")
-    lines.append("    integrity: f32,")
-    lines.append("    swing: ?OffensiveProfileDefinition = null,")
-    lines.append("    thrust: ?OffensiveProfileDefinition = null,")
-    lines.append("    defence: DefensiveProfileDefinition,")
-    lines.append("    ranged: ?RangedDefinition = null,")
-    lines.append("    moment_of_inertia: f32,")
-    lines.append("    effective_mass: f32,")
-    lines.append("    reference_energy_j: f32,")
-    lines.append("    geometry_coeff: f32,")
-    lines.append("    rigidity_coeff: f32,")
-    lines.append("};")
-    lines.append("")
-    lines.append("pub const GeneratedWeapons = [_]WeaponDefinition{")
+    w(
+        "pub const DefenderModifiersDefinition = struct {\n"
+        "    reach: combat.Reach,\n"
+        "    parry: f32,\n"
+        "    deflect: f32,\n"
+        "    block: f32,\n"
+        "    fragility: f32,\n"
+        "};\n"
+        "\n"
+        "pub const OffensiveProfileDefinition = struct {\n"
+        "    name: []const u8,\n"
+        "    reach: combat.Reach,\n"
+        "    damage_types: []const damage.Kind,\n"
+        "    accuracy: f32,\n"
+        "    speed: f32,\n"
+        "    damage: f32,\n"
+        "    penetration: f32,\n"
+        "    penetration_max: f32,\n"
+        "    fragility: f32,\n"
+        "    defender_modifiers: DefenderModifiersDefinition,\n"
+        "};\n"
+        "\n"
+        "pub const DefensiveProfileDefinition = struct {\n"
+        "    name: []const u8,\n"
+        "    reach: combat.Reach,\n"
+        "    parry: f32,\n"
+        "    deflect: f32,\n"
+        "    block: f32,\n"
+        "    fragility: f32,\n"
+        "};\n"
+        "\n"
+        "pub const GripDefinition = struct {\n"
+        "    one_handed: bool = false,\n"
+        "    two_handed: bool = false,\n"
+        "    versatile: bool = false,\n"
+        "    bastard: bool = false,\n"
+        "    half_sword: bool = false,\n"
+        "    murder_stroke: bool = false,\n"
+        "};\n"
+        "\n"
+        "pub const FeaturesDefinition = struct {\n"
+        "    hooked: bool = false,\n"
+        "    spiked: bool = false,\n"
+        "    crossguard: bool = false,\n"
+        "    pommel: bool = false,\n"
+        "};\n"
+        "\n"
+        "pub const ThrownDefinition = struct {\n"
+        "    throw: OffensiveProfileDefinition,\n"
+        "    range: combat.Reach,\n"
+        "};\n"
+        "\n"
+        "pub const ProjectileDefinition = struct {\n"
+        "    ammunition: weapon.ProjectileType,\n"
+        "    range: combat.Reach,\n"
+        "    accuracy: f32,\n"
+        "    speed: f32,\n"
+        "    reload: f32,\n"
+        "};\n"
+        "\n"
+        "pub const RangedDefinition = struct {\n"
+        "    projectile: ?ProjectileDefinition = null,\n"
+        "    thrown: ?ThrownDefinition = null,\n"
+        "};\n"
+        "\n"
+        "pub const WeaponDefinition = struct {\n"
+        "    id: []const u8,\n"
+        "    name: []const u8,\n"
+        "    categories: []const weapon.Category,\n"
+        "    features: FeaturesDefinition = .{},\n"
+        "    grip: GripDefinition = .{},\n"
+        "    length: f32,\n"
+        "    weight: f32,\n"
+        "    balance: f32,\n"
+        "    integrity: f32,\n"
+        "    swing: ?OffensiveProfileDefinition = null,\n"
+        "    thrust: ?OffensiveProfileDefinition = null,\n"
+        "    defence: DefensiveProfileDefinition,\n"
+        "    ranged: ?RangedDefinition = null,\n"
+        "    moment_of_inertia: f32,\n"
+        "    effective_mass: f32,\n"
+        "    reference_energy_j: f32,\n"
+        "    geometry_coeff: f32,\n"
+        "    rigidity_coeff: f32,\n"
+        "};\n"
+        "\n"
+        "pub const GeneratedWeapons = [_]WeaponDefinition{\n"
+    )
 
     for weapon_id, data in weapons:
-        lines.append("    .{")
-        lines.append(f'        .id = "{weapon_id}",')
-        lines.append(f'        .name = "{data.get("name", weapon_id)}",')
-        lines.append(f'        .categories = {format_categories_list(data.get("categories", []))},')
-
-        # Features
-        features = data.get("features", {})
-        lines.append("        .features = .{")
-        if features.get("hooked"):
-            lines.append("            .hooked = true,")
-        if features.get("spiked"):
-            lines.append("            .spiked = true,")
-        if features.get("crossguard"):
-            lines.append("            .crossguard = true,")
-        if features.get("pommel"):
-            lines.append("            .pommel = true,")
-        lines.append("        },")
-
-        # Grip
-        grip = data.get("grip", {})
-        lines.append("        .grip = .{")
-        if grip.get("one_handed"):
-            lines.append("            .one_handed = true,")
-        if grip.get("two_handed"):
-            lines.append("            .two_handed = true,")
-        if grip.get("versatile"):
-            lines.append("            .versatile = true,")
-        if grip.get("bastard"):
-            lines.append("            .bastard = true,")
-        if grip.get("half_sword"):
-            lines.append("            .half_sword = true,")
-        if grip.get("murder_stroke"):
-            lines.append("            .murder_stroke = true,")
-        lines.append("        },")
-
-        # Physical dimensions
-        lines.append(f'        .length = {zig_float(data.get("length_cm", 0.0))},')
-        lines.append(f'        .weight = {zig_float(data.get("weight_kg", 0.0))},')
-        lines.append(f'        .balance = {zig_float(data.get("balance", 0.0))},')
-        lines.append(f'        .integrity = {zig_float(data.get("integrity", 100.0))},')
-
-        # Swing profile
         swing = data.get("swing")
-        if swing:
-            lines.append("        .swing = .{")
-            lines.extend(emit_offensive_profile(swing, "            "))
-            lines.append("        },")
-
-        # Thrust profile
         thrust = data.get("thrust")
-        if thrust:
-            lines.append("        .thrust = .{")
-            lines.extend(emit_offensive_profile(thrust, "            "))
-            lines.append("        },")
-
-        # Defence profile (required)
-        defence = data.get("defence", {})
-        lines.append("        .defence = .{")
-        lines.extend(emit_defensive_profile(defence, "            "))
-        lines.append("        },")
-
-        # Ranged
         ranged = data.get("ranged")
-        if ranged:
-            lines.append("        .ranged = .{")
-            thrown = ranged.get("thrown")
-            if thrown:
-                lines.append("            .thrown = .{")
-                lines.append("                .throw = .{")
-                lines.extend(emit_offensive_profile(thrown.get("throw", {}), "                    "))
-                lines.append("                },")
-                lines.append(f"                .range = {format_reach(thrown.get('range', 'medium'))},")
-                lines.append("            },")
-            projectile = ranged.get("projectile")
-            if projectile:
-                lines.append("            .projectile = .{")
-                lines.append(f"                .ammunition = {format_projectile_type(projectile.get('ammunition', 'stone'))},")
-                lines.append(f"                .range = {format_reach(projectile.get('range', 'far'))},")
-                lines.append(f"                .accuracy = {zig_float(projectile.get('accuracy', 1.0))},")
-                lines.append(f"                .speed = {zig_float(projectile.get('speed', 1.0))},")
-                lines.append(f"                .reload = {zig_float(projectile.get('reload', 0.0))},")
-                lines.append("            },")
-            lines.append("        },")
-
-        # Physics
-        lines.append(f'        .moment_of_inertia = {zig_float(data.get("moment_of_inertia", 0.0))},')
-        lines.append(f'        .effective_mass = {zig_float(data.get("effective_mass", 0.0))},')
-        lines.append(f'        .reference_energy_j = {zig_float(data.get("reference_energy_j", 0.0))},')
-        lines.append(f'        .geometry_coeff = {zig_float(data.get("geometry_coeff", 0.0))},')
-        lines.append(f'        .rigidity_coeff = {zig_float(data.get("rigidity_coeff", 0.0))},')
-
-        lines.append("    },")
-
-    lines.append("};")
-    return "\n".join(lines)
+        w(WEAPON_TEMPLATE % {
+            "id": zig_str(weapon_id),
+            "name": zig_str(data.get("name", weapon_id)),
+            "categories": format_categories_list(data.get("categories", [])),
+            "features": format_true_flags(data.get("features", EMPTY), WEAPON_FEATURE_FLAGS, "            "),
+            "grip": format_true_flags(data.get("grip", EMPTY), WEAPON_GRIP_FLAGS, "            "),
+            "length": zig_float(data.get("length_cm", 0.0)),
+            "weight": zig_float(data.get("weight_kg", 0.0)),
+            "balance": zig_float(data.get("balance", 0.0)),
+            "integrity": zig_float(data.get("integrity", 100.0)),
+            "swing": f"        .swing = .{{\n{emit_offensive_profile(swing, '            ')}        }},\n" if swing else "",
+            "thrust": f"        .thrust = .{{\n{emit_offensive_profile(thrust, '            ')}        }},\n" if thrust else "",
+            "defence": emit_defensive_profile(data.get("defence", EMPTY), "            "),
+            "ranged": emit_ranged(ranged) if ranged else "",
+            "moment_of_inertia": zig_float(data.get("moment_of_inertia", 0.0)),
+            "effective_mass": zig_float(data.get("effective_mass", 0.0)),
+            "reference_energy_j": zig_float(data.get("reference_energy_j", 0.0)),
+            "geometry_coeff": zig_float(data.get("geometry_coeff", 0.0)),
+            "rigidity_coeff": zig_float(data.get("rigidity_coeff", 0.0)),
+        })
+
+    w("};")
+    return buf.getvalue()
 
 
 def flatten_techniques(root: Dict[str, Any]) -> List[Dict[str, Any]]:
@@ -557,6 +621,7 @@ def flatten_techniques(root: Dict[str, Any]) -> List[Dict[str, Any]]:
     return results
 
 
+@lru_cache(maxsize=None)
 def format_height(value: Any) -> str:
     if not value:
         return "null"
@@ -566,182 +631,220 @@ def format_height(value: Any) -> str:
 def format_damage_types(types: List[str]) -> str:
     if not types:
         return "&.{}"
-    inner = ", ".join(f"damage.Kind.{t}" for t in types)
+    inner = ", ".join([f"damage.Kind.{t}" for t in types])
     return f"&.{{ {inner} }}"
 
 
 def format_scaling(scaling: Dict[str, Any]) -> str:
     ratio = zig_float(scaling.get("ratio", 1.0))
-    stats = scaling.get("stats", {})
+    stats = scaling.get("stats", EMPTY)
     if "stat" in stats:
         accessor = stats["stat"]
         return f".{{ .ratio = {ratio}, .stats = .{{ .stat = stats.Accessor.{accessor} }} }}"
     average = stats.get("average", [])
     if average and len(average) == 2:
+        first, second = average
         return (
-            ".{ .ratio = "
-            + ratio
-            + ", .stats = .{ .average = .{ stats.Accessor."
-            + average[0]
-            + ", stats.Accessor."
-            + average[1]
-            + " } } }"
+            f".{{ .ratio = {ratio}, .stats = .{{ .average = .{{ "
+            f"stats.Accessor.{first}, stats.Accessor.{second} }} }} }}"
         )
     return f".{{ .ratio = {ratio}, .stats = .{{ .stat = stats.Accessor.power }} }}"
 
 
+TECHNIQUE_TEMPLATE = (
+    "    .{\n"
+    "        .id = %(id)s,\n"
+    "        .name = %(name)s,\n"
+    "        .attack_mode = %(attack_mode)s,\n"
+    "        .target_height = %(target_height)s,\n"
+    "        .secondary_height = %(secondary_height)s,\n"
+    "        .guard_height = %(guard_height)s,\n"
+    "        .covers_adjacent = %(covers_adjacent)s,\n"
+    "        .difficulty = %(difficulty)s,\n"
+    "        .channels = .{ .weapon = %(weapon)s, .off_hand = %(off_hand)s, .footwork = %(footwork)s },\n"
+    "        .damage_instances = &.{\n%(instances)s        },\n"
+    "        .scaling = %(scaling)s,\n"
+    "        .deflect_mult = %(deflect_mult)s,\n"
+    "        .parry_mult = %(parry_mult)s,\n"
+    "        .dodge_mult = %(dodge_mult)s,\n"
+    "        .counter_mult = %(counter_mult)s,\n"
+    "        .overlay_offensive_to_hit_bonus = %(to_hit_bonus)s,\n"
+    "        .overlay_offensive_damage_mult = %(damage_mult)s,\n"
+    "        .overlay_defensive_defense_bonus = %(defense_bonus)s,\n"
+    "        .axis_geometry_mult = %(geometry_mult)s,\n"
+    "        .axis_energy_mult = %(energy_mult)s,\n"
+    "        .axis_rigidity_mult = %(rigidity_mult)s,\n"
+    "    },\n"
+)
+
+
 def emit_techniques(techniques: List[Dict[str, Any]]) -> str:
-    lines: List[str] = []
-    lines.append("const TechniqueChannels = struct {")
-    lines.append("    weapon: bool = false,")
-    lines.append("    off_hand: bool = false,")
-    lines.append("    footwork: bool = false,")
-    lines.append("};")
-    lines.append("")
-    lines.append("pub const TechniqueDefinition = struct {")
-    lines.append("    id: []const u8,")
-    lines.append("    name: []const u8,")
-    lines.append("    attack_mode: []const u8,")
-    lines.append("    target_height: ?body.Height = null,")
-    lines.append("    secondary_height: ?body.Height = null,")
-    lines.append("    guard_height: ?body.Height = null,")
-    lines.append("    covers_adjacent: bool = false,")
-    lines.append("    difficulty: f32 = 0,")
-    lines.append("    channels: TechniqueChannels = .{},")
-    lines.append("    damage_instances: []const damage.Instance = &.{},")
-    lines.append("    scaling: stats.Scaling = .{ .ratio = 1.0, .stats = .{ .stat = stats.Accessor.power } },")
-    lines.append("    deflect_mult: f32 = 1.0,")
-    lines.append("    parry_mult: f32 = 1.0,")
-    lines.append("    dodge_mult: f32 = 1.0,")
-    lines.append("    counter_mult: f32 = 1.0,")
-    lines.append("    overlay_offensive_to_hit_bonus: f32 = 0,")
-    lines.append("    overlay_offensive_damage_mult: f32 = 1,")
-    lines.append("    overlay_defensive_defense_bonus: f32 = 0,")
-    lines.append("    axis_geometry_mult: f32 = 1,")
-    lines.append("    axis_energy_mult: f32 = 1,")
-    lines.append("    axis_rigidity_mult: f32 = 1,")
-    lines.append("};")
-    lines.append("")
-    lines.append("pub const GeneratedTechniques = [_]TechniqueDefinition{")
+    if not techniques:
+        return ""
+    buf = io.StringIO()
+    w = buf.write
+    w(
+        "const TechniqueChannels = struct {\n"
+        "    weapon: bool = false,\n"
+        "    off_hand: bool = false,\n"
+        "    footwork: bool = false,\n"
+        "};\n"
+        "\n"
+        "pub const TechniqueDefinition = struct {\n"
+        "    id: []const u8,\n"
+        "    name: []const u8,\n"
+        "    attack_mode: []const u8,\n"
+        "    target_height: ?body.Height = null,\n"
+        "    secondary_height: ?body.Height = null,\n"
+        "    guard_height: ?body.Height = null,\n"
+        "    covers_adjacent: bool = false,\n"
+        "    difficulty: f32 = 0,\n"
+        "    channels: TechniqueChannels = .{},\n"
+        "    damage_instances: []const damage.Instance = &.{},\n"
+        "    scaling: stats.Scaling = .{ .ratio = 1.0, .stats = .{ .stat = stats.Accessor.power } },\n"
+        "    deflect_mult: f32 = 1.0,\n"
+        "    parry_mult: f32 = 1.0,\n"
+        "    dodge_mult: f32 = 1.0,\n"
+        "    counter_mult: f32 = 1.0,\n"
+        "    overlay_offensive_to_hit_bonus: f32 = 0,\n"
+        "    overlay_offensive_damage_mult: f32 = 1,\n"
+        "    overlay_defensive_defense_bonus: f32 = 0,\n"
+        "    axis_geometry_mult: f32 = 1,\n"
+        "    axis_energy_mult: f32 = 1,\n"
+        "    axis_rigidity_mult: f32 = 1,\n"
+        "};\n"
+        "\n"
+        "pub const GeneratedTechniques = [_]TechniqueDefinition{\n"
+    )
     for entry in techniques:
-        lines.append("    .{")
-        lines.append(f'        .id = "{entry.get("id", "")}",')
-        lines.append(f'        .name = "{entry.get("name", "")}",')
-        lines.append(f'        .attack_mode = "{entry.get("attack_mode", "none")}",')
-        lines.append(f"        .target_height = {format_height(entry.get('target_height'))},")
-        lines.append(f"        .secondary_height = {format_height(entry.get('secondary_height'))},")
-        lines.append(f"        .guard_height = {format_height(entry.get('guard_height'))},")
-        lines.append(f"        .covers_adjacent = {zig_bool(entry.get('covers_adjacent', False))},")
-        lines.append(f"        .difficulty = {zig_float(entry.get('difficulty', 0.0))},")
-        channels = entry.get("channels", {})
-        lines.append(
-            "        .channels = .{ .weapon = "
-            + zig_bool(channels.get("weapon", False))
-            + ", .off_hand = "
-            + zig_bool(channels.get("off_hand", False))
-            + ", .footwork = "
-            + zig_bool(channels.get("footwork", False))
-            + " },"
-        )
-        damage_block = entry.get("damage", {})
-        instances = damage_block.get("instances", [])
-        lines.append("        .damage_instances = &.{")
-        for inst in instances:
-            types = format_damage_types(inst.get("types", []))
-            lines.append(
-                "            .{ .amount = "
-                + zig_float(inst.get("amount", 0.0))
-                + ", .types = "
-                + types
-                + " },"
-            )
-        lines.append("        },")
-        scaling = damage_block.get("scaling", {})
-        lines.append(f"        .scaling = {format_scaling(scaling)},")
-        lines.append(f'        .deflect_mult = {zig_float(entry.get("deflect_mult", 1.0))},')
-        lines.append(f'        .parry_mult = {zig_float(entry.get("parry_mult", 1.0))},')
-        lines.append(f'        .dodge_mult = {zig_float(entry.get("dodge_mult", 1.0))},')
-        lines.append(f'        .counter_mult = {zig_float(entry.get("counter_mult", 1.0))},')
-        overlay = entry.get("overlay_bonus", {})
-        offensive = overlay.get("offensive", {})
-        defensive = overlay.get("defensive", {})
-        lines.append(
-            f'        .overlay_offensive_to_hit_bonus = {zig_float(offensive.get("to_hit_bonus", 0.0))},'
-        )
-        lines.append(
-            f'        .overlay_offensive_damage_mult = {zig_float(offensive.get("damage_mult", 1.0))},'
-        )
-        lines.append(
-            f'        .overlay_defensive_defense_bonus = {zig_float(defensive.get("defense_bonus", 0.0))},'
-        )
-        axis = entry.get("axis_bias", {})
-        lines.append(f'        .axis_geometry_mult = {zig_float(axis.get("geometry_mult", 1.0))},')
-        lines.append(f'        .axis_energy_mult = {zig_float(axis.get("energy_mult", 1.0))},')
-        lines.append(f'        .axis_rigidity_mult = {zig_float(axis.get("rigidity_mult", 1.0))},')
-        lines.append("    },")
-    lines.append("};")
-    return "\n".join(lines)
+        channels = entry.get("channels", EMPTY)
+        damage_block = entry.get("damage", EMPTY)
+        instances = "".join([
+            f"            .{{ .amount = {zig_float(inst.get('amount', 0.0))}, "
+            f".types = {format_damage_types(inst.get('types', []))} }},\n"
+            for inst in damage_block.get("instances", [])
+        ])
+        overlay = entry.get("overlay_bonus", EMPTY)
+        offensive = overlay.get("offensive", EMPTY)
+        defensive = overlay.get("defensive", EMPTY)
+        axis = entry.get("axis_bias", EMPTY)
+        w(TECHNIQUE_TEMPLATE % {
+            "id": zig_str(entry.get("id", "")),
+            "name": zig_str(entry.get("name", "")),
+            "attack_mode": zig_str(entry.get("attack_mode", "none")),
+            "target_height": format_height(entry.get("target_height")),
+            "secondary_height": format_height(entry.get("secondary_height")),
+            "guard_height": format_height(entry.get("guard_height")),
+            "covers_adjacent": zig_bool(entry.get("covers_adjacent", False)),
+            "difficulty": zig_float(entry.get("difficulty", 0.0)),
+            "weapon": zig_bool(channels.get("weapon", False)),
+            "off_hand": zig_bool(channels.get("off_hand", False)),
+            "footwork": zig_bool(channels.get("footwork", False)),
+            "instances": instances,
+            "scaling": format_scaling(damage_block.get("scaling", EMPTY)),
+            "deflect_mult": zig_float(entry.get("deflect_mult", 1.0)),
+            "parry_mult": zig_float(entry.get("parry_mult", 1.0)),
+            "dodge_mult": zig_float(entry.get("dodge_mult", 1.0)),
+            "counter_mult": zig_float(entry.get("counter_mult", 1.0)),
+            "to_hit_bonus": zig_float(offensive.get("to_hit_bonus", 0.0)),
+            "damage_mult": zig_float(offensive.get("damage_mult", 1.0)),
+            "defense_bonus": zig_float(defensive.get("defense_bonus", 0.0)),
+            "geometry_mult": zig_float(axis.get("geometry_mult", 1.0)),
+            "energy_mult": zig_float(axis.get("energy_mult", 1.0)),
+            "rigidity_mult": zig_float(axis.get("rigidity_mult", 1.0)),
+        })
+    w("};")
+    return buf.getvalue()
+
+
+TISSUE_LAYER_TEMPLATE = (
+    "            .{\n"
+    "                .material_id = %(material_id)s,\n"
+    "                .thickness_ratio = %(thickness_ratio)s,\n"
+    "                .deflection = %(deflection)s,\n"
+    "                .absorption = %(absorption)s,\n"
+    "                .dispersion = %(dispersion)s,\n"
+    "                .geometry_threshold = %(geometry_threshold)s,\n"
+    "                .geometry_ratio = %(geometry_ratio)s,\n"
+    "                .energy_threshold = %(energy_threshold)s,\n"
+    "                .energy_ratio = %(energy_ratio)s,\n"
+    "                .rigidity_threshold = %(rigidity_threshold)s,\n"
+    "                .rigidity_ratio = %(rigidity_ratio)s,\n"
+    "                .is_structural = %(is_structural)s,\n"
+    "            },\n"
+)
+
+TISSUE_TEMPLATE_TEMPLATE = (
+    "    .{\n"
+    "        .id = %(id)s,\n"
+    "%(notes)s"
+    "        .layers = &.{\n%(layers)s        },\n"
+    "    },\n"
+)
+
+
+def format_tissue_layer(layer: Dict[str, Any]) -> str:
+    material = layer.get("material", EMPTY)
+    shielding = material.get("shielding", EMPTY)
+    suscept = material.get("susceptibility", EMPTY)
+    return TISSUE_LAYER_TEMPLATE % {
+        "material_id": zig_str(layer.get("material_id", "")),
+        "thickness_ratio": zig_float(layer.get("thickness_ratio", 0.0)),
+        "deflection": zig_float(shielding.get("deflection", 0.0)),
+        "absorption": zig_float(shielding.get("absorption", 0.0)),
+        "dispersion": zig_float(shielding.get("dispersion", 0.0)),
+        "geometry_threshold": zig_float(suscept.get("geometry_threshold", 0.0)),
+        "geometry_ratio": zig_float(suscept.get("geometry_ratio", 0.0)),
+        "energy_threshold": zig_float(suscept.get("energy_threshold", 0.0)),
+        "energy_ratio": zig_float(suscept.get("energy_ratio", 0.0)),
+        "rigidity_threshold": zig_float(suscept.get("rigidity_threshold", 0.0)),
+        "rigidity_ratio": zig_float(suscept.get("rigidity_ratio", 0.0)),
+        "is_structural": zig_bool(material.get("is_structural", False)),
+    }
 
 
 def emit_tissue_templates(templates: Dict[str, Any]) -> str:
-    def material_field(layer: Dict[str, Any], key: str, field: str) -> float:
-        material = layer.get("material", {})
-        section = material.get(key, {})
-        return float(section.get(field, 0.0))
-
-    lines: List[str] = []
-    lines.append("pub const TissueLayerDefinition = struct {")
-    lines.append("    material_id: []const u8,")
-    lines.append("    thickness_ratio: f32,")
-    lines.append("    deflection: f32,")
-    lines.append("    absorption: f32,")
-    lines.append("    dispersion: f32,")
-    lines.append("    geometry_threshold: f32,")
-    lines.append("    geometry_ratio: f32,")
-    lines.append("    energy_threshold: f32,")
-    lines.append("    energy_ratio: f32,")
-    lines.append("    rigidity_threshold: f32,")
-    lines.append("    rigidity_ratio: f32,")
-    lines.append("    is_structural: bool,")
-    lines.append("};")
-    lines.append("")
-    lines.append("pub const TissueTemplateDefinition = struct {")
-    lines.append("    id: []const u8,")
-    lines.append("    notes: []const u8 = \"\",")
-    lines.append("    layers: []const TissueLayerDefinition,")
-    lines.append("};")
-    lines.append("")
-    lines.append("pub const GeneratedTissueTemplates = [_]TissueTemplateDefinition{")
-    for template_id, template in sorted(templates.items()):
-        lines.append("    .{")
-        lines.append(f'        .id = "{template_id}",')
+    if not templates:
+        return ""
+    buf = io.StringIO()
+    w = buf.write
+    w(
+        "pub const TissueLayerDefinition = struct {\n"
+        "    material_id: []const u8,\n"
+        "    thickness_ratio: f32,\n"
+        "    deflection: f32,\n"
+        "    absorption: f32,\n"
+        "    dispersion: f32,\n"
+        "    geometry_threshold: f32,\n"
+        "    geometry_ratio: f32,\n"
+        "    energy_threshold: f32,\n"
+        "    energy_ratio: f32,\n"
+        "    rigidity_threshold: f32,\n"
+        "    rigidity_ratio: f32,\n"
+        "    is_structural: bool,\n"
+        "};\n"
+        "\n"
+        "pub const TissueTemplateDefinition = struct {\n"
+        "    id: []const u8,\n"
+        "    notes: []const u8 = \"\",\n"
+        "    layers: []const TissueLayerDefinition,\n"
+        "};\n"
+        "\n"
+        "pub const GeneratedTissueTemplates = [_]TissueTemplateDefinition{\n"
+    )
+    for template_id in sorted(templates):
+        template = templates[template_id]
         notes = template.get("notes", "")
-        if notes:
-            lines.append(f'        .notes = "{notes}",')
-        layers = template.get("layers", [])
-        lines.append("        .layers = &.{")
-        for layer in layers:
-            lines.append("            .{")
-            lines.append(f'                .material_id = "{layer.get("material_id", "")}",')
-            lines.append(f'                .thickness_ratio = {zig_float(layer.get("thickness_ratio", 0.0))},')
-            lines.append(f'                .deflection = {zig_float(material_field(layer, "shielding", "deflection"))},')
-            lines.append(f'                .absorption = {zig_float(material_field(layer, "shielding", "absorption"))},')
-            lines.append(f'                .dispersion = {zig_float(material_field(layer, "shielding", "dispersion"))},')
-            lines.append(f'                .geometry_threshold = {zig_float(material_field(layer, "susceptibility", "geometry_threshold"))},')
-            lines.append(f'                .geometry_ratio = {zig_float(material_field(layer, "susceptibility", "geometry_ratio"))},')
-            lines.append(f'                .energy_threshold = {zig_float(material_field(layer, "susceptibility", "energy_threshold"))},')
-            lines.append(f'                .energy_ratio = {zig_float(material_field(layer, "susceptibility", "energy_ratio"))},')
-            lines.append(f'                .rigidity_threshold = {zig_float(material_field(layer, "susceptibility", "rigidity_threshold"))},')
-            lines.append(f'                .rigidity_ratio = {zig_float(material_field(layer, "susceptibility", "rigidity_ratio"))},')
-            is_structural = layer.get("material", {}).get("is_structural", False)
-            lines.append(f'                .is_structural = {"true" if is_structural else "false"},')
-            lines.append("            },")
-        lines.append("        },")
-        lines.append("    },")
-    lines.append("};")
-    return "\n".join(lines)
+        w(TISSUE_TEMPLATE_TEMPLATE % {
+            "id": zig_str(template_id),
+            "notes": f"        .notes = {zig_str(notes)},\n" if notes else "",
+            "layers": "".join(map(format_tissue_layer, template.get("layers", []))),
+        })
+    w("};")
+    return buf.getvalue()
 
 
+@lru_cache(maxsize=None)
 def format_part_tag(tag: str) -> str:
     # Use local PartTag since it's now generated in this file
     return f"PartTag.{tag}"
@@ -759,26 +862,28 @@ def emit_part_tags(tags: List[str]) -> str:
     return "\n".join(lines)
 
 
+SIDES = {
+    "left": "body.Side.left",
+    "right": "body.Side.right",
+    "center": "body.Side.center",
+    "none": "body.Side.none",
+}
+
+
 def format_side(side: str) -> str:
-    mapping = {
-        "left": "body.Side.left",
-        "right": "body.Side.right",
-        "center": "body.Side.center",
-        "none": "body.Side.none",
-    }
-    return mapping.get(side, "body.Side.center")
+    return SIDES.get(side, "body.Side.center")
 
 
 def format_tissue_template_string(tpl: str) -> str:
     """Return tissue template as string ID for lookup in generated tables."""
-    return f'"{tpl}"'
+    return zig_str(tpl)
 
 
 def format_optional_string(value: str | None) -> str:
     """Format an optional string field for Zig."""
     if value is None:
         return "null"
-    return f'"{value}"'
+    return zig_str(value)
 
 
 def format_part_flags(flags: Dict[str, Any]) -> str:
@@ -802,234 +907,318 @@ def format_part_flags(flags: Dict[str, Any]) -> str:
 
 
 def topological_sort_parts(parts: Dict[str, Any]) -> List[tuple]:
-    """Sort body parts so parents come before children."""
-    # Build adjacency: child -> parent
+    """Sort body parts so parents come before children.
+
+    Parts are emitted one depth level at a time, alphabetically within a level.
+    """
+    # Build adjacency: parent -> children; parts without a known parent are roots
+    children: Dict[str, List[str]] = {}
+    level: List[str] = []
+    for name, part in parts.items():
+        parent = part.get("parent")
+        if parent is None or parent not in parts:
+            level.append(name)
+        else:
+            children.setdefault(parent, []).append(name)
+
     result = []
-    remaining = set(parts.keys())
-
-    while remaining:
-        # Find parts whose parent is already emitted (or has no parent)
-        ready = []
-        for name in remaining:
-            parent = parts[name].get("parent")
-            if parent is None or parent not in remaining:
-                ready.append(name)
-
-        if not ready:
-            # Cycle or missing parent - fall back to alphabetical for remaining
-            ready = sorted(remaining)
-
-        # Add ready parts in alphabetical order for determinism
-        for name in sorted(ready):
+    while level:
+        # Add each level in alphabetical order for determinism
+        level.sort()
+        next_level: List[str] = []
+        for name in level:
             result.append((name, parts[name]))
-            remaining.discard(name)
+            next_level.extend(children.get(name, ()))
+        level = next_level
+
+    if len(result) < len(parts):
+        # Cycle - fall back to alphabetical for remaining
+        emitted = {name for name, _ in result}
+        result.extend((name, parts[name]) for name in sorted(parts) if name not in emitted)
 
     return result
 
 
+BODY_PART_TEMPLATE = (
+    "            .{\n"
+    "                .name = %(name)s,\n"
+    "                .tag = %(tag)s,\n"
+    "                .side = %(side)s,\n"
+    "%(parent)s"
+    "%(enclosing)s"
+    "                .tissue_template_id = %(tissue_template_id)s,\n"
+    "%(artery)s"
+    "                .flags = %(flags)s,\n"
+    "                .geometry = .{ .thickness_cm = %(thickness_cm)s, .length_cm = %(length_cm)s, .area_cm2 = %(area_cm2)s },\n"
+    "            },\n"
+)
+
+BODY_PLAN_TEMPLATE = (
+    "    .{\n"
+    "        .id = %(id)s,\n"
+    "        .name = %(name)s,\n"
+    "        .base_height_cm = %(base_height_cm)s,\n"
+    "        .base_mass_kg = %(base_mass_kg)s,\n"
+    "        .parts = &.{\n%(parts)s        },\n"
+    "    },\n"
+)
+
+
+def format_body_part(part_name: str, part: Dict[str, Any]) -> str:
+    parent = part.get("parent")
+    enclosing = part.get("enclosing")
+    geom = part.get("geometry", EMPTY)
+    return BODY_PART_TEMPLATE % {
+        "name": zig_str(part_name),
+        "tag": format_part_tag(part.get("tag", "torso")),
+        "side": format_side(part.get("side", "center")),
+        "parent": f"                .parent = {zig_str(parent)},\n" if parent is not None else "",
+        "enclosing": f"                .enclosing = {zig_str(enclosing)},\n" if enclosing is not None else "",
+        "tissue_template_id": format_tissue_template_string(part.get("tissue_template", "limb")),
+        "artery": "                .has_major_artery = true,\n" if part.get("has_major_artery") else "",
+        "flags": format_part_flags(part.get("flags", EMPTY)),
+        "thickness_cm": zig_float(geom.get("thickness_cm", 0.0)),
+        "length_cm": zig_float(geom.get("length_cm", 0.0)),
+        "area_cm2": zig_float(geom.get("area_cm2", 0.0)),
+    }
+
+
 def emit_body_plans(plans: Dict[str, Any]) -> str:
-    lines: List[str] = []
-    lines.append("pub const BodyPartGeometry = struct {")
-    lines.append("    thickness_cm: f32,")
-    lines.append("    length_cm: f32,")
-    lines.append("    area_cm2: f32,")
-    lines.append("};")
-    lines.append("")
-    lines.append("pub const BodyPartDefinition = struct {")
-    lines.append("    name: []const u8,")
-    lines.append("    tag: PartTag,")
-    lines.append("    side: body.Side = body.Side.center,")
-    lines.append("    parent: ?[]const u8 = null,")
-    lines.append("    enclosing: ?[]const u8 = null,")
-    lines.append("    tissue_template_id: []const u8,")
-    lines.append("    has_major_artery: bool = false,")
-    lines.append("    flags: body.PartDef.Flags = .{},")
-    lines.append("    geometry: BodyPartGeometry,")
-    lines.append("};")
-    lines.append("")
-    lines.append("pub const BodyPlanDefinition = struct {")
-    lines.append("    id: []const u8,")
-    lines.append("    name: []const u8,")
-    lines.append("    base_height_cm: f32,")
-    lines.append("    base_mass_kg: f32,")
-    lines.append("    parts: []const BodyPartDefinition,")
-    lines.append("};")
-    lines.append("")
-    lines.append("pub const GeneratedBodyPlans = [_]BodyPlanDefinition{")
-    for plan_id, plan in sorted(plans.items()):
-        lines.append("    .{")
-        lines.append(f'        .id = "{plan_id}",')
-        lines.append(f'        .name = "{plan.get("name", plan_id)}",')
-        lines.append(f'        .base_height_cm = {zig_float(plan.get("base_height_cm", 0.0))},')
-        lines.append(f'        .base_mass_kg = {zig_float(plan.get("base_mass_kg", 0.0))},')
-        parts = plan.get("parts", {})
-        lines.append("        .parts = &.{")
-        for part_name, part in topological_sort_parts(parts):
-            lines.append("            .{")
-            lines.append(f'                .name = "{part_name}",')
-            lines.append(f"                .tag = {format_part_tag(part.get('tag', 'torso'))},")
-            lines.append(f"                .side = {format_side(part.get('side', 'center'))},")
-            parent = part.get("parent")
-            if parent is not None:
-                lines.append(f'                .parent = "{parent}",')
-            enclosing = part.get("enclosing")
-            if enclosing is not None:
-                lines.append(f'                .enclosing = "{enclosing}",')
-            lines.append(
-                f"                .tissue_template_id = {format_tissue_template_string(part.get('tissue_template', 'limb'))},"
-            )
-            if part.get("has_major_artery"):
-                lines.append("                .has_major_artery = true,")
-            flags = format_part_flags(part.get("flags", {}))
-            lines.append(f"                .flags = {flags},")
-            geom = part.get("geometry", {})
-            geom_line = (
-                "                .geometry = .{ "
-                + f".thickness_cm = {zig_float(geom.get('thickness_cm', 0.0))}, "
-                + f".length_cm = {zig_float(geom.get('length_cm', 0.0))}, "
-                + f".area_cm2 = {zig_float(geom.get('area_cm2', 0.0))} "
-                + "},"
-            )
-            lines.append(geom_line)
-            lines.append("            },")
-        lines.append("        },")
-        lines.append("    },")
-    lines.append("};")
-    return "\n".join(lines)
+    if not plans:
+        return ""
+    buf = io.StringIO()
+    w = buf.write
+    w(
+        "pub const BodyPartGeometry = struct {\n"
+        "    thickness_cm: f32,\n"
+        "    length_cm: f32,\n"
+        "    area_cm2: f32,\n"
+        "};\n"
+        "\n"
+        "pub const BodyPartDefinition = struct {\n"
+        "    name: []const u8,\n"
+        "    tag: PartTag,\n"
+        "    side: body.Side = body.Side.center,\n"
+        "    parent: ?[]const u8 = null,\n"
+        "    enclosing: ?[]const u8 = null,\n"
+        "    tissue_template_id: []const u8,\n"
+        "    has_major_artery: bool = false,\n"
+        "    flags: body.PartDef.Flags = .{},\n"
+        "    geometry: BodyPartGeometry,\n"
+        "};\n"
+        "\n"
+        "pub const BodyPlanDefinition = struct {\n"
+        "    id: []const u8,\n"
+        "    name: []const u8,\n"
+        "    base_height_cm: f32,\n"
+        "    base_mass_kg: f32,\n"
+        "    parts: []const BodyPartDefinition,\n"
+        "};\n"
+        "\n"
+        "pub const GeneratedBodyPlans = [_]BodyPlanDefinition{\n"
+    )
+    for plan_id in sorted(plans):
+        plan = plans[plan_id]
+        parts = topological_sort_parts(plan.get("parts", EMPTY))
+        w(BODY_PLAN_TEMPLATE % {
+            "id": zig_str(plan_id),
+            "name": zig_str(plan.get("name", plan_id)),
+            "base_height_cm": zig_float(plan.get("base_height_cm", 0.0)),
+            "base_mass_kg": zig_float(plan.get("base_mass_kg", 0.0)),
+            "parts": "".join([format_body_part(name, part) for name, part in parts]),
+        })
+    w("};")
+    return buf.getvalue()
 
 
 def flatten_armour_materials(root: Dict[str, Any]) -> List[Tuple[str, Dict[str, Any]]]:
     """Extract armour materials from materials.armour."""
-    armour_mats = root.get("materials", {}).get("armour", {})
+    armour_mats = root.get("materials", EMPTY).get("armour", EMPTY)
     results: List[Tuple[str, Dict[str, Any]]] = []
     for key, value in armour_mats.items():
         if isinstance(value, dict) and "name" in value:
             results.append((key, value))
-    return sorted(results, key=lambda x: x[0])
+    results.sort(key=itemgetter(0))
+    return results
 
 
 def flatten_armour_pieces(root: Dict[str, Any]) -> List[Tuple[str, Dict[str, Any]]]:
     """Extract armour pieces from armour_pieces."""
-    pieces = root.get("armour_pieces", {})
+    pieces = root.get("armour_pieces", EMPTY)
     results: List[Tuple[str, Dict[str, Any]]] = []
     for key, value in pieces.items():
         if isinstance(value, dict) and "id" in value:
             results.append((value["id"], value))
-    return sorted(results, key=lambda x: x[0])
+    results.sort(key=itemgetter(0))
+    return results
+
+
+TOTALITIES = {
+    name: f"armour.Totality.{name}"
+    for name in ("total", "intimidating", "comprehensive", "frontal", "minimal")
+}
+
+# Maps CUE layer types to inventory.Layer equipment slots
+ARMOUR_LAYERS = {
+    "padding": "inventory.Layer.Gambeson",
+    "outer": "inventory.Layer.Plate",
+    "cloak": "inventory.Layer.Cloak",
+}
 
 
 def format_totality(totality: str) -> str:
-    valid = {"total", "intimidating", "comprehensive", "frontal", "minimal"}
-    if totality in valid:
-        return f"armour.Totality.{totality}"
-    return "armour.Totality.frontal"
+    return TOTALITIES.get(totality, "armour.Totality.frontal")
 
 
 def format_armour_layer(layer: str) -> str:
-    # Maps CUE layer types to inventory.Layer equipment slots
-    mapping = {
-        "padding": "Gambeson",
-        "outer": "Plate",
-        "cloak": "Cloak",
-    }
-    return f"inventory.Layer.{mapping.get(layer, 'Plate')}"
+    return ARMOUR_LAYERS.get(layer, "inventory.Layer.Plate")
+
+
+ARMOUR_MATERIAL_TEMPLATE = (
+    "    .{\n"
+    "        .id = %(id)s,\n"
+    "        .name = %(name)s,\n"
+    "        .deflection = %(deflection)s,\n"
+    "        .absorption = %(absorption)s,\n"
+    "        .dispersion = %(dispersion)s,\n"
+    "        .geometry_threshold = %(geometry_threshold)s,\n"
+    "        .geometry_ratio = %(geometry_ratio)s,\n"
+    "        .energy_threshold = %(energy_threshold)s,\n"
+    "        .energy_ratio = %(energy_ratio)s,\n"
+    "        .rigidity_threshold = %(rigidity_threshold)s,\n"
+    "        .rigidity_ratio = %(rigidity_ratio)s,\n"
+    "%(shape)s"
+    "    },\n"
+)
+
+ARMOUR_SHAPE_TEMPLATE = (
+    "        .shape_profile = %(profile)s,\n"
+    "        .shape_dispersion_bonus = %(dispersion_bonus)s,\n"
+    "        .shape_absorption_bonus = %(absorption_bonus)s,\n"
+)
 
 
 def emit_armour_materials(materials: List[Tuple[str, Dict[str, Any]]]) -> str:
-    lines: List[str] = []
-    lines.append("pub const ArmourMaterialDefinition = struct {")
-    lines.append("    id: []const u8,")
-    lines.append("    name: []const u8,")
-    lines.append("    deflection: f32,")
-    lines.append("    absorption: f32,")
-    lines.append("    dispersion: f32,")
-    lines.append("    geometry_threshold: f32,")
-    lines.append("    geometry_ratio: f32,")
-    lines.append("    energy_threshold: f32,")
-    lines.append("    energy_ratio: f32,")
-    lines.append("    rigidity_threshold: f32,")
-    lines.append("    rigidity_ratio: f32,")
-    lines.append("    shape_profile: []const u8 = \"solid\",")
-    lines.append("    shape_dispersion_bonus: f32 = 0,")
-    lines.append("    shape_absorption_bonus: f32 = 0,")
-    lines.append("};")
-    lines.append("")
-    lines.append("pub const GeneratedArmourMaterials = [_]ArmourMaterialDefinition{")
+    if not materials:
+        return ""
+    buf = io.StringIO()
+    w = buf.write
+    w(
+        "pub const ArmourMaterialDefinition = struct {\n"
+        "    id: []const u8,\n"
+        "    name: []const u8,\n"
+        "    deflection: f32,\n"
+        "    absorption: f32,\n"
+        "    dispersion: f32,\n"
+        "    geometry_threshold: f32,\n"
+        "    geometry_ratio: f32,\n"
+        "    energy_threshold: f32,\n"
+        "    energy_ratio: f32,\n"
+        "    rigidity_threshold: f32,\n"
+        "    rigidity_ratio: f32,\n"
+        "    shape_profile: []const u8 = \"solid\",\n"
+        "    shape_dispersion_bonus: f32 = 0,\n"
+        "    shape_absorption_bonus: f32 = 0,\n"
+        "};\n"
+        "\n"
+        "pub const GeneratedArmourMaterials = [_]ArmourMaterialDefinition{\n"
+    )
     for mat_id, data in materials:
-        shielding = data.get("shielding", {})
-        suscept = data.get("susceptibility", {})
-        shape = data.get("shape", {})
-        lines.append("    .{")
-        lines.append(f'        .id = "{mat_id}",')
-        lines.append(f'        .name = "{data.get("name", mat_id)}",')
-        lines.append(f'        .deflection = {zig_float(shielding.get("deflection", 0.0))},')
-        lines.append(f'        .absorption = {zig_float(shielding.get("absorption", 0.0))},')
-        lines.append(f'        .dispersion = {zig_float(shielding.get("dispersion", 0.0))},')
-        lines.append(f'        .geometry_threshold = {zig_float(suscept.get("geometry_threshold", 0.0))},')
-        lines.append(f'        .geometry_ratio = {zig_float(suscept.get("geometry_ratio", 1.0))},')
-        lines.append(f'        .energy_threshold = {zig_float(suscept.get("energy_threshold", 0.0))},')
-        lines.append(f'        .energy_ratio = {zig_float(suscept.get("energy_ratio", 1.0))},')
-        lines.append(f'        .rigidity_threshold = {zig_float(suscept.get("rigidity_threshold", 0.0))},')
-        lines.append(f'        .rigidity_ratio = {zig_float(suscept.get("rigidity_ratio", 1.0))},')
-        if shape:
-            lines.append(f'        .shape_profile = "{shape.get("profile", "solid")}",')
-            lines.append(f'        .shape_dispersion_bonus = {zig_float(shape.get("dispersion_bonus", 0.0))},')
-            lines.append(f'        .shape_absorption_bonus = {zig_float(shape.get("absorption_bonus", 0.0))},')
-        lines.append("    },")
-    lines.append("};")
-    return "\n".join(lines)
+        shielding = data.get("shielding", EMPTY)
+        suscept = data.get("susceptibility", EMPTY)
+        shape = data.get("shape", EMPTY)
+        w(ARMOUR_MATERIAL_TEMPLATE % {
+            "id": zig_str(mat_id),
+            "name": zig_str(data.get("name", mat_id)),
+            "deflection": zig_float(shielding.get("deflection", 0.0)),
+            "absorption": zig_float(shielding.get("absorption", 0.0)),
+            "dispersion": zig_float(shielding.get("dispersion", 0.0)),
+            "geometry_threshold": zig_float(suscept.get("geometry_threshold", 0.0)),
+            "geometry_ratio": zig_float(suscept.get("geometry_ratio", 1.0)),
+            "energy_threshold": zig_float(suscept.get("energy_threshold", 0.0)),
+            "energy_ratio": zig_float(suscept.get("energy_ratio", 1.0)),
+            "rigidity_threshold": zig_float(suscept.get("rigidity_threshold", 0.0)),
+            "rigidity_ratio": zig_float(suscept.get("rigidity_ratio", 1.0)),
+            "shape": ARMOUR_SHAPE_TEMPLATE % {
+                "profile": zig_str(shape.get("profile", "solid")),
+                "dispersion_bonus": zig_float(shape.get("dispersion_bonus", 0.0)),
+                "absorption_bonus": zig_float(shape.get("absorption_bonus", 0.0)),
+            } if shape else "",
+        })
+    w("};")
+    return buf.getvalue()
+
+
+ARMOUR_COVERAGE_TEMPLATE = (
+    "            .{\n"
+    "                .part_tags = &.{ %(part_tags)s },\n"
+    "                .side = %(side)s,\n"
+    "                .layer = %(layer)s,\n"
+    "                .totality = %(totality)s,\n"
+    "            },\n"
+)
+
+ARMOUR_PIECE_TEMPLATE = (
+    "    .{\n"
+    "        .id = %(id)s,\n"
+    "        .name = %(name)s,\n"
+    "        .material_id = %(material_id)s,\n"
+    "        .coverage = &.{\n%(coverage)s        },\n"
+    "    },\n"
+)
+
+
+def format_armour_coverage(cov: Dict[str, Any]) -> str:
+    return ARMOUR_COVERAGE_TEMPLATE % {
+        "part_tags": ", ".join(map(format_part_tag, cov.get("part_tags", []))),
+        "side": format_side(cov.get("side", "center")),
+        "layer": format_armour_layer(cov.get("layer", "outer")),
+        "totality": format_totality(cov.get("totality", "frontal")),
+    }
 
 
 def emit_armour_pieces(pieces: List[Tuple[str, Dict[str, Any]]]) -> str:
-    lines: List[str] = []
-    lines.append("pub const ArmourCoverageEntry = struct {")
-    lines.append("    part_tags: []const PartTag,")
-    lines.append("    side: body.Side = body.Side.center,")
-    lines.append("    layer: inventory.Layer,")
-    lines.append("    totality: armour.Totality,")
-    lines.append("};")
-    lines.append("")
-    lines.append("pub const ArmourPieceDefinition = struct {")
-    lines.append("    id: []const u8,")
-    lines.append("    name: []const u8,")
-    lines.append("    material_id: []const u8,")
-    lines.append("    coverage: []const ArmourCoverageEntry,")
-    lines.append("};")
-    lines.append("")
-    lines.append("pub const GeneratedArmourPieces = [_]ArmourPieceDefinition{")
+    if not pieces:
+        return ""
+    buf = io.StringIO()
+    w = buf.write
+    w(
+        "pub const ArmourCoverageEntry = struct {\n"
+        "    part_tags: []const PartTag,\n"
+        "    side: body.Side = body.Side.center,\n"
+        "    layer: inventory.Layer,\n"
+        "    totality: armour.Totality,\n"
+        "};\n"
+        "\n"
+        "pub const ArmourPieceDefinition = struct {\n"
+        "    id: []const u8,\n"
+        "    name: []const u8,\n"
+        "    material_id: []const u8,\n"
+        "    coverage: []const ArmourCoverageEntry,\n"
+        "};\n"
+        "\n"
+        "pub const GeneratedArmourPieces = [_]ArmourPieceDefinition{\n"
+    )
     for piece_id, data in pieces:
-        lines.append("    .{")
-        lines.append(f'        .id = "{piece_id}",')
-        lines.append(f'        .name = "{data.get("name", piece_id)}",')
-        lines.append(f'        .material_id = "{data.get("material", "")}",')
-        coverage = data.get("coverage", [])
-        lines.append("        .coverage = &.{")
-        for cov in coverage:
-            part_tags = cov.get("part_tags", [])
-            tags_str = ", ".join(f"PartTag.{t}" for t in part_tags)
-            side = format_side(cov.get("side", "center"))
-            layer = format_armour_layer(cov.get("layer", "outer"))
-            totality = format_totality(cov.get("totality", "frontal"))
-            lines.append("            .{")
-            lines.append(f"                .part_tags = &.{{ {tags_str} }},")
-            lines.append(f"                .side = {side},")
-            lines.append(f"                .layer = {layer},")
-            lines.append(f"                .totality = {totality},")
-            lines.append("            },")
-        lines.append("        },")
-        lines.append("    },")
-    lines.append("};")
-    return "\n".join(lines)
+        w(ARMOUR_PIECE_TEMPLATE % {
+            "id": zig_str(piece_id),
+            "name": zig_str(data.get("name", piece_id)),
+            "material_id": zig_str(data.get("material", "")),
+            "coverage": "".join(map(format_armour_coverage, data.get("coverage", []))),
+        })
+    w("};")
+    return buf.getvalue()
 
 
 def flatten_combat_tests(root: Dict[str, Any]) -> List[Tuple[str, Dict[str, Any]]]:
     """Extract combat tests from combat_tests."""
-    tests = root.get("combat_tests", {})
+    tests = root.get("combat_tests", EMPTY)
     results: List[Tuple[str, Dict[str, Any]]] = []
     for key, value in tests.items():
         if isinstance(value, dict) and "id" in value:
             results.append((value["id"], value))
-    return sorted(results, key=lambda x: x[0])
+    results.sort(key=itemgetter(0))
+    return results
 
 
 def format_optional_float(value: Any) -> str:
@@ -1046,6 +1235,7 @@ def format_optional_bool(value: Any) -> str:
     return zig_bool(value)
 
 
+@lru_cache(maxsize=None)
 def format_optional_int(value: Any) -> str:
     """Format an optional int field for Zig."""
     if value is None:
@@ -1053,179 +1243,213 @@ def format_optional_int(value: Any) -> str:
     return str(int(value))
 
 
+ATTACKER_STAT_FIELDS = (
+    ("power", "power", zig_float),
+    ("speed", "speed", zig_float),
+    ("skill", "skill", zig_float),
+)
+
+EXPECTED_OUTCOME_FIELDS = (
+    ("outcome", "outcome", zig_str),
+    ("damage_dealt_min", "damage_dealt_min", zig_float),
+    ("damage_dealt_max", "damage_dealt_max", zig_float),
+    ("packet_energy_min", "packet_energy_min", zig_float),
+    ("packet_geometry_min", "packet_geometry_min", zig_float),
+    ("armour_deflected", "armour_deflected", zig_bool),
+    ("penetrated_layers_min", "penetrated_layers_min", format_optional_int),
+    ("penetrated_layers_max", "penetrated_layers_max", format_optional_int),
+)
+
+COMBAT_TEST_TEMPLATE = (
+    "    .{\n"
+    "        .id = %(id)s,\n"
+    "        .description = %(description)s,\n"
+    "        .attacker = .{\n"
+    "            .species = %(attacker_species)s,\n"
+    "            .weapon_id = %(weapon_id)s,\n"
+    "            .technique_id = %(technique_id)s,\n"
+    "            .stakes = %(stakes)s,\n"
+    "%(stats)s"
+    "        },\n"
+    "        .defender = .{\n"
+    "            .species = %(defender_species)s,\n"
+    "            .armour_ids = &.{ %(armour_ids)s },\n"
+    "            .pose = %(pose)s,\n"
+    "            .target_part = %(target_part)s,\n"
+    "        },\n"
+    "        .expected = .{\n%(expected)s        },\n"
+    "    },\n"
+)
+
+
 def emit_combat_tests(tests: List[Tuple[str, Dict[str, Any]]]) -> str:
-    lines: List[str] = []
-    lines.append("pub const AttackerSpec = struct {")
-    lines.append("    species: []const u8 = \"dwarf\",")
-    lines.append("    weapon_id: []const u8,")
-    lines.append("    technique_id: []const u8,")
-    lines.append("    stakes: []const u8 = \"committed\",")
-    lines.append("    power: ?f32 = null,")
-    lines.append("    speed: ?f32 = null,")
-    lines.append("    skill: ?f32 = null,")
-    lines.append("};")
-    lines.append("")
-    lines.append("pub const DefenderSpec = struct {")
-    lines.append("    species: []const u8 = \"dwarf\",")
-    lines.append("    armour_ids: []const []const u8 = &.{},")
-    lines.append("    pose: []const u8 = \"balanced\",")
-    lines.append("    target_part: []const u8 = \"torso\",")
-    lines.append("};")
-    lines.append("")
-    lines.append("pub const ExpectedOutcome = struct {")
-    lines.append("    outcome: ?[]const u8 = null,")
-    lines.append("    damage_dealt_min: ?f32 = null,")
-    lines.append("    damage_dealt_max: ?f32 = null,")
-    lines.append("    packet_energy_min: ?f32 = null,")
-    lines.append("    packet_geometry_min: ?f32 = null,")
-    lines.append("    armour_deflected: ?bool = null,")
-    lines.append("    penetrated_layers_min: ?u8 = null,")
-    lines.append("    penetrated_layers_max: ?u8 = null,")
-    lines.append("};")
-    lines.append("")
-    lines.append("pub const CombatTestDefinition = struct {")
-    lines.append("    id: []const u8,")
-    lines.append("    description: []const u8,")
-    lines.append("    attacker: AttackerSpec,")
-    lines.append("    defender: DefenderSpec,")
-    lines.append("    expected: ExpectedOutcome,")
-    lines.append("};")
-    lines.append("")
-    lines.append("pub const GeneratedCombatTests = [_]CombatTestDefinition{")
+    if not tests:
+        return ""
+    buf = io.StringIO()
+    w = buf.write
+    w(
+        "pub const AttackerSpec = struct {\n"
+        "    species: []const u8 = \"dwarf\",\n"
+        "    weapon_id: []const u8,\n"
+        "    technique_id: []const u8,\n"
+        "    stakes: []const u8 = \"committed\",\n"
+        "    power: ?f32 = null,\n"
+        "    speed: ?f32 = null,\n"
+        "    skill: ?f32 = null,\n"
+        "};\n"
+        "\n"
+        "pub const DefenderSpec = struct {\n"
+        "    species: []const u8 = \"dwarf\",\n"
+        "    armour_ids: []const []const u8 = &.{},\n"
+        "    pose: []const u8 = \"balanced\",\n"
+        "    target_part: []const u8 = \"torso\",\n"
+        "};\n"
+        "\n"
+        "pub const ExpectedOutcome = struct {\n"
+        "    outcome: ?[]const u8 = null,\n"
+        "    damage_dealt_min: ?f32 = null,\n"
+        "    damage_dealt_max: ?f32 = null,\n"
+        "    packet_energy_min: ?f32 = null,\n"
+        "    packet_geometry_min: ?f32 = null,\n"
+        "    armour_deflected: ?bool = null,\n"
+        "    penetrated_layers_min: ?u8 = null,\n"
+        "    penetrated_layers_max: ?u8 = null,\n"
+        "};\n"
+        "\n"
+        "pub const CombatTestDefinition = struct {\n"
+        "    id: []const u8,\n"
+        "    description: []const u8,\n"
+        "    attacker: AttackerSpec,\n"
+        "    defender: DefenderSpec,\n"
+        "    expected: ExpectedOutcome,\n"
+        "};\n"
+        "\n"
+        "pub const GeneratedCombatTests = [_]CombatTestDefinition{\n"
+    )
     for test_id, data in tests:
-        attacker = data.get("attacker", {})
-        defender = data.get("defender", {})
-        expected = data.get("expected", {})
-        attacker_stats = attacker.get("stats", {})
-        armour_ids = defender.get("armour_ids", [])
-        armour_str = ", ".join(f'"{aid}"' for aid in armour_ids)
-
-        lines.append("    .{")
-        lines.append(f'        .id = "{test_id}",')
-        lines.append(f'        .description = "{data.get("description", "")}",')
-        lines.append("        .attacker = .{")
-        lines.append(f'            .species = "{attacker.get("species", "dwarf")}",')
-        lines.append(f'            .weapon_id = "{attacker.get("weapon_id", "")}",')
-        lines.append(f'            .technique_id = "{attacker.get("technique_id", "")}",')
-        lines.append(f'            .stakes = "{attacker.get("stakes", "committed")}",')
-        if attacker_stats.get("power") is not None:
-            lines.append(f'            .power = {zig_float(attacker_stats["power"])},')
-        if attacker_stats.get("speed") is not None:
-            lines.append(f'            .speed = {zig_float(attacker_stats["speed"])},')
-        if attacker_stats.get("skill") is not None:
-            lines.append(f'            .skill = {zig_float(attacker_stats["skill"])},')
-        lines.append("        },")
-        lines.append("        .defender = .{")
-        lines.append(f'            .species = "{defender.get("species", "dwarf")}",')
-        lines.append(f"            .armour_ids = &.{{ {armour_str} }},")
-        lines.append(f'            .pose = "{defender.get("pose", "balanced")}",')
-        lines.append(f'            .target_part = "{defender.get("target_part", "torso")}",')
-        lines.append("        },")
-        lines.append("        .expected = .{")
-        if expected.get("outcome") is not None:
-            lines.append(f'            .outcome = "{expected["outcome"]}",')
-        if expected.get("damage_dealt_min") is not None:
-            lines.append(f'            .damage_dealt_min = {zig_float(expected["damage_dealt_min"])},')
-        if expected.get("damage_dealt_max") is not None:
-            lines.append(f'            .damage_dealt_max = {zig_float(expected["damage_dealt_max"])},')
-        if expected.get("packet_energy_min") is not None:
-            lines.append(f'            .packet_energy_min = {zig_float(expected["packet_energy_min"])},')
-        if expected.get("packet_geometry_min") is not None:
-            lines.append(f'            .packet_geometry_min = {zig_float(expected["packet_geometry_min"])},')
-        if expected.get("armour_deflected") is not None:
-            lines.append(f'            .armour_deflected = {zig_bool(expected["armour_deflected"])},')
-        if expected.get("penetrated_layers_min") is not None:
-            lines.append(f'            .penetrated_layers_min = {int(expected["penetrated_layers_min"])},')
-        if expected.get("penetrated_layers_max") is not None:
-            lines.append(f'            .penetrated_layers_max = {int(expected["penetrated_layers_max"])},')
-        lines.append("        },")
-        lines.append("    },")
-    lines.append("};")
-    return "\n".join(lines)
+        attacker = data.get("attacker", EMPTY)
+        defender = data.get("defender", EMPTY)
+        w(COMBAT_TEST_TEMPLATE % {
+            "id": zig_str(test_id),
+            "description": zig_str(data.get("description", "")),
+            "attacker_species": zig_str(attacker.get("species", "dwarf")),
+            "weapon_id": zig_str(attacker.get("weapon_id", "")),
+            "technique_id": zig_str(attacker.get("technique_id", "")),
+            "stakes": zig_str(attacker.get("stakes", "committed")),
+            "stats": format_present_fields(attacker.get("stats", EMPTY), ATTACKER_STAT_FIELDS, "            "),
+            "defender_species": zig_str(defender.get("species", "dwarf")),
+            "armour_ids": ", ".join(map(zig_str, defender.get("armour_ids", []))),
+            "pose": zig_str(defender.get("pose", "balanced")),
+            "target_part": zig_str(defender.get("target_part", "torso")),
+            "expected": format_present_fields(data.get("expected", EMPTY), EXPECTED_OUTCOME_FIELDS, "            "),
+        })
+    w("};")
+    return buf.getvalue()
+
+
+SPECIES_RECOVERY_FIELDS = (
+    ("stamina_recovery", "stamina_recovery", zig_float),
+    ("focus_recovery", "focus_recovery", zig_float),
+    ("blood_recovery", "blood_recovery", zig_float),
+)
+
+SPECIES_SIZE_FIELDS = (
+    ("size_height", "height", zig_float),
+    ("size_mass", "mass", zig_float),
+)
+
+NATURAL_WEAPON_TEMPLATE = "            .{ .weapon_id = %(weapon_id)s, .required_part = %(required_part)s },\n"
+
+SPECIES_TEMPLATE = (
+    "    .{\n"
+    "        .id = %(id)s,\n"
+    "        .name = %(name)s,\n"
+    "        .body_plan = %(body_plan)s,\n"
+    "        .base_blood = %(base_blood)s,\n"
+    "        .base_stamina = %(base_stamina)s,\n"
+    "        .base_focus = %(base_focus)s,\n"
+    "%(recovery)s"
+    "%(size)s"
+    "        .tags = %(tags)s,\n"
+    "        .natural_weapons = &.{\n%(natural_weapons)s        },\n"
+    "    },\n"
+)
 
 
 def emit_species(species_map: Dict[str, Any]) -> str:
-    lines: List[str] = []
-    lines.append("pub const NaturalWeaponRef = struct {")
-    lines.append("    weapon_id: []const u8,")
-    lines.append("    required_part: PartTag,")
-    lines.append("};")
-    lines.append("")
-    lines.append("pub const SpeciesDefinition = struct {")
-    lines.append("    id: []const u8,")
-    lines.append("    name: []const u8,")
-    lines.append("    body_plan: []const u8,")
-    lines.append("    base_blood: f32,")
-    lines.append("    base_stamina: f32,")
-    lines.append("    base_focus: f32,")
-    lines.append("    stamina_recovery: ?f32 = null,")
-    lines.append("    focus_recovery: ?f32 = null,")
-    lines.append("    blood_recovery: ?f32 = null,")
-    lines.append("    size_height: f32 = 1.0,")
-    lines.append("    size_mass: f32 = 1.0,")
-    lines.append("    tags: []const []const u8 = &.{},")
-    lines.append("    natural_weapons: []const NaturalWeaponRef = &.{},")
-    lines.append("};")
-    lines.append("")
-    lines.append("pub const GeneratedSpecies = [_]SpeciesDefinition{")
-    for species_id, entry in sorted(species_map.items()):
-        lines.append("    .{")
-        lines.append(f'        .id = "{species_id}",')
-        lines.append(f'        .name = "{entry.get("name", species_id)}",')
-        lines.append(f'        .body_plan = "{entry.get("body_plan", "")}",')
-        lines.append(f'        .base_blood = {zig_float(entry.get("base_blood", 0.0))},')
-        lines.append(f'        .base_stamina = {zig_float(entry.get("base_stamina", 0.0))},')
-        lines.append(f'        .base_focus = {zig_float(entry.get("base_focus", 0.0))},')
-        if entry.get("stamina_recovery") is not None:
-            lines.append(f'        .stamina_recovery = {zig_float(entry["stamina_recovery"])},')
-        if entry.get("focus_recovery") is not None:
-            lines.append(f'        .focus_recovery = {zig_float(entry["focus_recovery"])},')
-        if entry.get("blood_recovery") is not None:
-            lines.append(f'        .blood_recovery = {zig_float(entry["blood_recovery"])},')
-        size = entry.get("size_modifiers", {})
-        if size.get("height") is not None:
-            lines.append(f'        .size_height = {zig_float(size["height"])},')
-        if size.get("mass") is not None:
-            lines.append(f'        .size_mass = {zig_float(size["mass"])},')
-        tags = entry.get("tags", [])
-        lines.append(f"        .tags = {zig_string_list(tags)},")
-        naturals = entry.get("natural_weapons", [])
-        lines.append("        .natural_weapons = &.{")
-        for natural in naturals:
-            part_expr = format_part_tag(natural.get("required_part", "hand"))
-            lines.append(
-                "            .{ "
-                + f'.weapon_id = "{natural.get("weapon_id", "")}", '
-                + f".required_part = {part_expr} "
-                + "},"
-            )
-        lines.append("        },")
-        lines.append("    },")
-    lines.append("};")
-    return "\n".join(lines)
+    if not species_map:
+        return ""
+    buf = io.StringIO()
+    w = buf.write
+    w(
+        "pub const NaturalWeaponRef = struct {\n"
+        "    weapon_id: []const u8,\n"
+        "    required_part: PartTag,\n"
+        "};\n"
+        "\n"
+        "pub const SpeciesDefinition = struct {\n"
+        "    id: []const u8,\n"
+        "    name: []const u8,\n"
+        "    body_plan: []const u8,\n"
+        "    base_blood: f32,\n"
+        "    base_stamina: f32,\n"
+        "    base_focus: f32,\n"
+        "    stamina_recovery: ?f32 = null,\n"
+        "    focus_recovery: ?f32 = null,\n"
+        "    blood_recovery: ?f32 = null,\n"
+        "    size_height: f32 = 1.0,\n"
+        "    size_mass: f32 = 1.0,\n"
+        "    tags: []const []const u8 = &.{},\n"
+        "    natural_weapons: []const NaturalWeaponRef = &.{},\n"
+        "};\n"
+        "\n"
+        "pub const GeneratedSpecies = [_]SpeciesDefinition{\n"
+    )
+    for species_id in sorted(species_map):
+        entry = species_map[species_id]
+        w(SPECIES_TEMPLATE % {
+            "id": zig_str(species_id),
+            "name": zig_str(entry.get("name", species_id)),
+            "body_plan": zig_str(entry.get("body_plan", "")),
+            "base_blood": zig_float(entry.get("base_blood", 0.0)),
+            "base_stamina": zig_float(entry.get("base_stamina", 0.0)),
+            "base_focus": zig_float(entry.get("base_focus", 0.0)),
+            "recovery": format_present_fields(entry, SPECIES_RECOVERY_FIELDS, "        "),
+            "size": format_present_fields(entry.get("size_modifiers", EMPTY), SPECIES_SIZE_FIELDS, "        "),
+            "tags": zig_string_list(entry.get("tags", [])),
+            "natural_weapons": "".join([
+                NATURAL_WEAPON_TEMPLATE % {
+                    "weapon_id": zig_str(natural.get("weapon_id", "")),
+                    "required_part": format_part_tag(natural.get("required_part", "hand")),
+                }
+                for natural in entry.get("natural_weapons", [])
+            ]),
+        })
+    w("};")
+    return buf.getvalue()
 
 
 def load_existing_technique_ids() -> Set[str]:
     ids: Set[str] = set()
+    capture = False
     try:
         with open(TECHNIQUE_ENUM_PATH, "r", encoding="utf-8") as f:
-            lines = f.readlines()
+            # Stream the file: only the lines up to the enum's closing brace are read.
+            for line in f:
+                stripped = line.strip()
+                if stripped.startswith("pub const TechniqueID"):
+                    capture = True
+                    continue
+                if capture:
+                    if stripped.startswith("};"):
+                        break
+                    if stripped.startswith("//") or not stripped:
+                        continue
+                    token = stripped.split("//")[0].strip().rstrip(",")
+                    if token:
+                        ids.add(token)
     except FileNotFoundError:
-        return ids
-    capture = False
-    for line in lines:
-        stripped = line.strip()
-        if stripped.startswith("pub const TechniqueID"):
-            capture = True
-            continue
-        if capture:
-            if stripped.startswith("};"):
-                break
-            if stripped.startswith("//") or not stripped:
-                continue
-            token = stripped.split("//")[0].strip().rstrip(",")
-            if token:
-                ids.add(token)
+        pass
     return ids
 
 
@@ -1234,6 +1458,12 @@ def load_existing_technique_ids() -> Set[str]:
 # =============================================================================
 
 
+WEAPON_PHYSICS_FIELDS = (
+    "moment_of_inertia", "effective_mass", "reference_energy_j", "geometry_coeff", "rigidity_coeff",
+)
+WEAPON_BASE_FIELDS = ("weight_kg", "length_cm")
+
+
 def audit_weapons(
     weapons: List[Tuple[str, Dict[str, Any]]], report: AuditReport
 ) -> None:
@@ -1258,22 +1488,15 @@ def audit_weapons(
         )
 
         # Check for zero physics fields
-        if data.get("moment_of_inertia", 0) == 0:
-            entry.warnings.append("moment_of_inertia is 0")
-        if data.get("effective_mass", 0) == 0:
-            entry.warnings.append("effective_mass is 0")
-        if data.get("reference_energy_j", 0) == 0:
-            entry.warnings.append("reference_energy_j is 0")
-        if data.get("geometry_coeff", 0) == 0:
-            entry.warnings.append("geometry_coeff is 0")
-        if data.get("rigidity_coeff", 0) == 0:
-            entry.warnings.append("rigidity_coeff is 0")
+        fields = entry.fields
+        for name in WEAPON_PHYSICS_FIELDS:
+            if fields[name] == 0:
+                entry.warnings.append(f"{name} is 0")
 
         # Check for missing base data
-        if data.get("weight_kg", 0) == 0:
-            entry.warnings.append("weight_kg is 0 (base data)")
-        if data.get("length_cm", 0) == 0:
-            entry.warnings.append("length_cm is 0 (base data)")
+        for name in WEAPON_BASE_FIELDS:
+            if fields[name] == 0:
+                entry.warnings.append(f"{name} is 0 (base data)")
 
         report.add_entry(entry)
 
@@ -1286,15 +1509,16 @@ def audit_techniques(
         tech_id = tech.get("id", "")
         report.technique_ids.add(tech_id)
 
-        axis = tech.get("axis_bias", {})
-        channels = tech.get("channels", {})
+        axis = tech.get("axis_bias", EMPTY)
+        channels = tech.get("channels", EMPTY)
+        attack_mode = tech.get("attack_mode", "none")
 
         entry = AuditEntry(
             dataset="techniques",
             id=tech_id,
             fields={
                 "name": tech.get("name", ""),
-                "attack_mode": tech.get("attack_mode", "none"),
+                "attack_mode": attack_mode,
                 "axis_geometry_mult": axis.get("geometry_mult", 1.0),
                 "axis_energy_mult": axis.get("energy_mult", 1.0),
                 "axis_rigidity_mult": axis.get("rigidity_mult", 1.0),
@@ -1315,9 +1539,11 @@ def audit_techniques(
                 entry.warnings.append("axis_bias.rigidity_mult not set (default 1.0)")
 
         # Check channels - at least one should be true for combat techniques
-        attack_mode = tech.get("attack_mode", "none")
         if attack_mode != "none":
-            has_channel = any(channels.values())
+            # Only the channels emit_techniques writes count (the schema allows no others)
+            has_channel = (
+                channels.get("weapon") or channels.get("off_hand") or channels.get("footwork")
+            )
             if not has_channel:
                 entry.warnings.append("No channels defined for combat technique")
 
@@ -1331,12 +1557,18 @@ def audit_armour_materials(
     for mat_id, data in materials:
         report.armour_material_ids.add(mat_id)
 
-        shielding = data.get("shielding", {})
-        suscept = data.get("susceptibility", {})
+        shielding = data.get("shielding", EMPTY)
+        suscept = data.get("susceptibility", EMPTY)
 
         deflection = shielding.get("deflection", 0)
         absorption = shielding.get("absorption", 0)
         dispersion = shielding.get("dispersion", 0)
+        geometry_threshold = suscept.get("geometry_threshold", 0)
+        geometry_ratio = suscept.get("geometry_ratio", 1)
+        energy_threshold = suscept.get("energy_threshold", 0)
+        energy_ratio = suscept.get("energy_ratio", 1)
+        rigidity_threshold = suscept.get("rigidity_threshold", 0)
+        rigidity_ratio = suscept.get("rigidity_ratio", 1)
 
         entry = AuditEntry(
             dataset="armour_materials",
@@ -1346,12 +1578,12 @@ def audit_armour_materials(
                 "deflection": deflection,
                 "absorption": absorption,
                 "dispersion": dispersion,
-                "geometry_threshold": suscept.get("geometry_threshold", 0),
-                "geometry_ratio": suscept.get("geometry_ratio", 1),
-                "energy_threshold": suscept.get("energy_threshold", 0),
-                "energy_ratio": suscept.get("energy_ratio", 1),
-                "rigidity_threshold": suscept.get("rigidity_threshold", 0),
-                "rigidity_ratio": suscept.get("rigidity_ratio", 1),
+                "geometry_threshold": geometry_threshold,
+                "geometry_ratio": geometry_ratio,
+                "energy_threshold": energy_threshold,
+                "energy_ratio": energy_ratio,
+                "rigidity_threshold": rigidity_threshold,
+                "rigidity_ratio": rigidity_ratio,
             },
         )
 
@@ -1363,9 +1595,11 @@ def audit_armour_materials(
             )
 
         # Check for zero thresholds with non-zero ratios (may be intentional)
-        for axis in ["geometry", "energy", "rigidity"]:
-            thr = suscept.get(f"{axis}_threshold", 0)
-            ratio = suscept.get(f"{axis}_ratio", 1)
+        for axis, thr, ratio in (
+            ("geometry", geometry_threshold, geometry_ratio),
+            ("energy", energy_threshold, energy_ratio),
+            ("rigidity", rigidity_threshold, rigidity_ratio),
+        ):
             if thr == 0 and ratio < 1:
                 entry.warnings.append(
                     f"{axis}_threshold=0 with {axis}_ratio={ratio:.2f} means all damage is reduced"
@@ -1418,7 +1652,8 @@ def audit_tissue_templates(
         report.tissue_template_ids.add(tpl_id)
 
         layers = tpl.get("layers", [])
-        thickness_sum = sum(layer.get("thickness_ratio", 0) for layer in layers)
+        thickness_sum = sum([layer.get("thickness_ratio", 0) for layer in layers])
+        materials = [layer.get("material_id", "") for layer in layers]
 
         entry = AuditEntry(
             dataset="tissue_templates",
@@ -1427,15 +1662,12 @@ def audit_tissue_templates(
                 "notes": tpl.get("notes", ""),
                 "layer_count": len(layers),
                 "thickness_sum": thickness_sum,
-                "materials": [layer.get("material_id", "") for layer in layers],
+                "materials": materials,
             },
         )
 
         # Collect material IDs
-        for layer in layers:
-            mat_id = layer.get("material_id", "")
-            if mat_id:
-                report.tissue_material_ids.add(mat_id)
+        report.tissue_material_ids.update(filter(None, materials))
 
         # Check thickness sum
         if abs(thickness_sum - 1.0) > 0.05:
@@ -1448,8 +1680,8 @@ def audit_tissue_templates(
             entry.errors.append("No layers defined")
 
         # Check each layer has a material
-        for i, layer in enumerate(layers):
-            if not layer.get("material_id"):
+        for i, mat_id in enumerate(materials):
+            if not mat_id:
                 entry.errors.append(f"Layer {i} has no material_id")
 
         report.add_entry(entry)
@@ -1463,7 +1695,7 @@ def audit_body_plans(
     for plan_id, plan in plans.items():
         report.body_plan_ids.add(plan_id)
 
-        parts = plan.get("parts", {})
+        parts = plan.get("parts", EMPTY)
 
         entry = AuditEntry(
             dataset="body_plans",
@@ -1488,7 +1720,7 @@ def audit_body_plans(
             else:
                 missing_tissue.append(part_name)
 
-            geom = part.get("geometry", {})
+            geom = part.get("geometry", EMPTY)
             if not geom or geom.get("thickness_cm", 0) == 0:
                 missing_geometry.append(part_name)
 
@@ -1518,12 +1750,14 @@ def audit_species(
     T042: Warns when species lacks size_modifiers (defaults applied at runtime).
     """
     for species_id, sp in species.items():
+        body_plan = sp.get("body_plan", "")
+
         entry = AuditEntry(
             dataset="species",
             id=species_id,
             fields={
                 "name": sp.get("name", ""),
-                "body_plan": sp.get("body_plan", ""),
+                "body_plan": body_plan,
                 "base_blood": sp.get("base_blood", 0),
                 "base_stamina": sp.get("base_stamina", 0),
                 "base_focus": sp.get("base_focus", 0),
@@ -1544,7 +1778,6 @@ def audit_species(
             entry.fields["size_mass"] = size_mods.get("mass", 1.0)
 
         # Check body_plan reference
-        body_plan = sp.get("body_plan", "")
         if not body_plan:
             entry.errors.append("Missing body_plan reference")
         else:
@@ -1556,22 +1789,20 @@ def audit_species(
 def validate_cross_references(report: AuditReport) -> None:
     """Check cross-references between datasets."""
     # Armour pieces -> materials
-    for entry in report.entries:
-        if entry.dataset == "armour_pieces":
-            mat_id = entry.fields.get("material_id", "")
-            if mat_id and mat_id not in report.armour_material_ids:
-                report.add_cross_ref_error(
-                    f"Armour piece '{entry.id}' references unknown material '{mat_id}'"
-                )
+    for entry in report.entries_by_dataset.get("armour_pieces", ()):
+        mat_id = entry.fields.get("material_id", "")
+        if mat_id and mat_id not in report.armour_material_ids:
+            report.add_cross_ref_error(
+                f"Armour piece '{entry.id}' references unknown material '{mat_id}'"
+            )
 
     # Body plans -> tissue templates
-    for entry in report.entries:
-        if entry.dataset == "body_plans":
-            for tpl_id in entry.fields.get("tissue_templates_used", []):
-                if tpl_id not in report.tissue_template_ids:
-                    report.add_cross_ref_error(
-                        f"Body plan '{entry.id}' references unknown tissue template '{tpl_id}'"
-                    )
+    for entry in report.entries_by_dataset.get("body_plans", ()):
+        for tpl_id in entry.fields.get("tissue_templates_used", []):
+            if tpl_id not in report.tissue_template_ids:
+                report.add_cross_ref_error(
+                    f"Body plan '{entry.id}' references unknown tissue template '{tpl_id}'"
+                )
 
     # Species -> body_plans (T042)
     for body_plan_ref in report.body_plan_refs:
@@ -1588,13 +1819,13 @@ def run_audit(data: Dict[str, Any]) -> AuditReport:
     report = AuditReport()
 
     # Flatten data
-    weapons = flatten_weapons(data.get("weapons", {}))
-    techniques = flatten_techniques(data.get("techniques", {}))
+    weapons = flatten_weapons(data.get("weapons", EMPTY))
+    techniques = flatten_techniques(data.get("techniques", EMPTY))
     armour_materials = flatten_armour_materials(data)
     armour_pieces = flatten_armour_pieces(data)
-    tissue_templates = data.get("tissue_templates", {})
-    body_plans = data.get("body_plans", {})
-    species = data.get("species", {})
+    tissue_templates = data.get("tissue_templates", EMPTY)
+    body_plans = data.get("body_plans", EMPTY)
+    species = data.get("species", EMPTY)
 
     # Run audits
     audit_weapons(weapons, report)
@@ -1606,6 +1837,7 @@ def run_audit(data: Dict[str, Any]) -> AuditReport:
     audit_species(species, report)
 
     # Cross-reference validation
+    report.freeze()
     validate_cross_references(report)
 
     return report
@@ -1616,93 +1848,80 @@ def run_audit(data: Dict[str, Any]) -> AuditReport:
 # =============================================================================
 
 
-def generate_zig(data: Dict[str, Any]) -> str:
-    """Generate Zig code from CUE data."""
-    weapons_root = data.get("weapons", {})
+def generate_zig(data: Dict[str, Any]) -> Iterator[str]:
+    """Generate Zig code from CUE data.
+
+    Yields the file one section at a time; the output is the chunks joined with "\n".
+    Technique ID validation runs before the first chunk is yielded.
+    """
+    weapons_root = data.get("weapons", EMPTY)
     weapons = flatten_weapons(weapons_root)
-    techniques_root = data.get("techniques", {})
+    techniques_root = data.get("techniques", EMPTY)
     techniques_raw = flatten_techniques(techniques_root)
-    cue_ids: Set[str] = set(entry.get("id", "") for entry in techniques_raw if entry.get("id"))
+    cue_ids: Set[str] = {tid for entry in techniques_raw if (tid := entry.get("id"))}
     existing_ids = load_existing_technique_ids()
     if existing_ids:
-        missing = sorted(existing_ids - cue_ids)
-        extra = sorted(cue_ids - existing_ids)
-        if missing or extra:
+        if existing_ids != cue_ids:
+            missing = existing_ids - cue_ids
+            extra = cue_ids - existing_ids
             if missing:
-                print("Missing techniques in CUE:", ", ".join(missing), file=sys.stderr)
+                print("Missing techniques in CUE:", ", ".join(sorted(missing)), file=sys.stderr)
             if extra:
-                print("Unexpected techniques in CUE:", ", ".join(extra), file=sys.stderr)
+                print("Unexpected techniques in CUE:", ", ".join(sorted(extra)), file=sys.stderr)
             sys.exit(1)
     technique_ids: List[str] = sorted(cue_ids)
-    armour_materials = flatten_armour_materials(data)
-    armour_pieces = flatten_armour_pieces(data)
 
     # Extract part_tags from taxonomy.cue
     part_tags = data.get("part_tags", [])
 
-    output: List[str] = [
-        "// AUTO-GENERATED BY scripts/cue_to_zig.py",
-        "// DO NOT EDIT MANUALLY.",
-        "",
-    ]
+    yield (
+        "// AUTO-GENERATED BY scripts/cue_to_zig.py\n"
+        "// DO NOT EDIT MANUALLY.\n"
+    )
 
     # Emit PartTag enum first (no dependencies, used by body.zig)
     if part_tags:
-        output.append(emit_part_tags(part_tags))
-        output.append("")
+        yield emit_part_tags(part_tags)
+        yield ""
 
     # Now emit imports (body.zig will import PartTag back from this file via body_list)
-    output.extend([
-        "const damage = @import(\"../domain/damage.zig\");",
-        "const stats = @import(\"../domain/stats.zig\");",
-        "const body = @import(\"../domain/body.zig\");",
-        "const armour = @import(\"../domain/armour.zig\");",
-        "const inventory = @import(\"../domain/inventory.zig\");",
-        "const weapon = @import(\"../domain/weapon.zig\");",
-        "const combat = @import(\"../domain/combat.zig\");",
-        "",
-    ])
+    yield (
+        "const damage = @import(\"../domain/damage.zig\");\n"
+        "const stats = @import(\"../domain/stats.zig\");\n"
+        "const body = @import(\"../domain/body.zig\");\n"
+        "const armour = @import(\"../domain/armour.zig\");\n"
+        "const inventory = @import(\"../domain/inventory.zig\");\n"
+        "const weapon = @import(\"../domain/weapon.zig\");\n"
+        "const combat = @import(\"../domain/combat.zig\");\n"
+    )
     if technique_ids:
-        output.append("pub const GeneratedTechniqueID = enum {")
-        for tid in technique_ids:
-            output.append(f"    {tid},")
-        output.append("};")
-        output.append("")
-    techniques = techniques_raw
-    if weapons:
-        output.append(emit_weapons(weapons))
-        output.append("")
-    if techniques:
-        output.append(emit_techniques(techniques))
-        output.append("")
-    tissue_templates = data.get("tissue_templates", {})
-    if tissue_templates:
-        output.append(emit_tissue_templates(tissue_templates))
-        output.append("")
-    body_plans_root = data.get("body_plans", {})
-    if body_plans_root:
-        output.append(emit_body_plans(body_plans_root))
-        output.append("")
-    species_root = data.get("species", {})
-    if species_root:
-        output.append(emit_species(species_root))
-        output.append("")
-    if armour_materials:
-        output.append(emit_armour_materials(armour_materials))
-        output.append("")
-    if armour_pieces:
-        output.append(emit_armour_pieces(armour_pieces))
-        output.append("")
-    combat_tests = flatten_combat_tests(data)
-    if combat_tests:
-        output.append(emit_combat_tests(combat_tests))
-    has_data = (
-        part_tags or weapons or techniques or tissue_templates or body_plans_root
-        or species_root or armour_materials or armour_pieces or combat_tests
+        yield (
+            "pub const GeneratedTechniqueID = enum {\n"
+            + "".join([f"    {tid},\n" for tid in technique_ids])
+            + "};\n"
+        )
+    # Each emitter returns "" for an empty dataset; only non-empty sections are written
+    has_data = bool(part_tags)
+    sections = (
+        (emit_weapons, weapons),
+        (emit_techniques, techniques_raw),
+        (emit_tissue_templates, data.get("tissue_templates", EMPTY)),
+        (emit_body_plans, data.get("body_plans", EMPTY)),
+        (emit_species, data.get("species", EMPTY)),
+        (emit_armour_materials, flatten_armour_materials(data)),
+        (emit_armour_pieces, flatten_armour_pieces(data)),
     )
-    if not has_data:
-        output.append("// No weapons, techniques, biological, armour, or test data found in input JSON.")
-    return "\n".join(output)
+    for emit, records in sections:
+        section = emit(records)
+        if section:
+            has_data = True
+            yield section
+            yield ""
+    combat_tests = emit_combat_tests(flatten_combat_tests(data))
+    if combat_tests:
+        yield combat_tests
+    elif not has_data:
+        yield "// No weapons, techniques, biological, armour, or test data found in input JSON."
 
 
 def main() -> None:
@@ -1712,15 +1931,13 @@ def main() -> None:
     # Audit mode
     if args.audit_report or args.audit_only:
         report = run_audit(data)
-        markdown = report.to_markdown()
 
         if args.audit_report:
             with open(args.audit_report, "w", encoding="utf-8") as f:
-                f.write(markdown)
-                f.write("\n")
+                report.write_markdown(f)
             print(f"Audit report written to: {args.audit_report}", file=sys.stderr)
         else:
-            print(markdown)
+            report.write_markdown(sys.stdout)
 
         # Exit with error code if there are errors
         if report.has_errors():
@@ -1742,8 +1959,20 @@ def main() -> None:
             return
 
     # Generate Zig code
-    zig_code = generate_zig(data)
-    sys.stdout.write(zig_code)
+    # Stream each section as it is generated, writing UTF-8 bytes unless
+    # stdout has been replaced by a text-only stream.
+    stdout = getattr(sys.stdout, "buffer", None)
+    if stdout is None:
+        write = sys.stdout.write
+    else:
+        def write(text: str) -> None:
+            stdout.write(text.encode("utf-8"))
+
+    chunks = generate_zig(data)
+    write(next(chunks))
+    for chunk in chunks:
+        write("\n")
+        write(chunk)
 
 
 if __name__ == "__main__":